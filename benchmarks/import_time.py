@@ -0,0 +1,71 @@
+# pipeline/benchmarks/import_time.py
+# Cold-import benchmark for the pipeline stages. Each module is imported in a
+# fresh interpreter; importing a stage must not load its models or read its
+# index, so it should stay well under the budget.
+#
+#   python benchmarks/import_time.py [--budget SECONDS] [--repeat N]
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STAGE_MODULES = (
+    "data_ingestion.utils",
+    "data_ingestion.main",
+    "deduplication.engine",
+    "summarization.engine",
+    "orchestration.pipeline",
+)
+
+# Loaded only when a stage actually runs
+HEAVY_MODULES = ("torch", "transformers", "sentence_transformers")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def cold_import(module: str) -> dict:
+    """
+    Import `module` in a fresh interpreter; returns {"seconds", "heavy"}.
+    """
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark cold import time of pipeline stages.")
+    ap.add_argument("--budget", type=float, default=2.0, help="max seconds per import")
+    ap.add_argument("--repeat", type=int, default=3, help="imports per module; the best is reported")
+    args = ap.parse_args()
+
+    failed = False
+    for module in STAGE_MODULES:
+        try:
+            runs = [cold_import(module) for _ in range(args.repeat)]
+        except subprocess.CalledProcessError as e:
+            print(f"  {module:<24} ERROR  {e.stderr.strip().splitlines()[-1] if e.stderr else e}")
+            failed = True
+            continue
+        best = min(r["seconds"] for r in runs)
+        heavy = runs[0]["heavy"]
+        ok = best <= args.budget and not heavy
+        failed |= not ok
+        note = f"  loaded {', '.join(heavy)}" if heavy else ""
+        print(f"  {module:<24} {'ok' if ok else 'SLOW':<5} {best:>6.3f}s{note}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
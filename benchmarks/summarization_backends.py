@@ -0,0 +1,139 @@
+# pipeline/benchmarks/summarization_backends.py
+# Latency, throughput and quality of each summarization backend on a fixed
+# fixture set. Quality is ROUGE F1 against the fp32 "torch" backend's
+# summaries of the same articles, so a quantized backend is judged by how
+# closely it reproduces what the pipeline produces today.
+#
+#   python benchmarks/summarization_backends.py [--backends torch torch-int8 onnx]
+#                                               [--repeat N] [--min-rouge-l F] [--out PATH]
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from summarization import engine  # noqa: E402
+from summarization.backends import BACKENDS  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures", "summarization_articles.json")
+REFERENCE = "torch"
+
+_WORD = re.compile(r"\w+")
+
+
+def _tokens(text: str) -> list:
+    return _WORD.findall(text.lower())
+
+
+def _f1(overlap: int, hyp_total: int, ref_total: int) -> float:
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / hyp_total, overlap / ref_total
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_n(ref: str, hyp: str, n: int) -> float:
+    def grams(tokens):
+        return Counter(tuple(tokens[i : i + n]) for i in range(len(tokens) - n + 1))
+    r, h = grams(_tokens(ref)), grams(_tokens(hyp))
+    return _f1(sum((r & h).values()), sum(h.values()), sum(r.values()))
+
+
+def rouge_l(ref: str, hyp: str) -> float:
+    r, h = _tokens(ref), _tokens(hyp)
+    # Longest common subsequence, one row at a time
+    prev = [0] * (len(h) + 1)
+    for a in r:
+        cur = [0]
+        for j, b in enumerate(h):
+            cur.append(prev[j] + 1 if a == b else max(prev[j + 1], cur[j]))
+        prev = cur
+    return _f1(prev[-1], len(h), len(r))
+
+
+def rouge(refs: list, hyps: list) -> dict:
+    """
+    Mean ROUGE-1/2/L F1 of `hyps` against `refs`.
+    """
+    n = max(1, len(refs))
+    return {
+        "rouge1": round(sum(rouge_n(r, h, 1) for r, h in zip(refs, hyps)) / n, 4),
+        "rouge2": round(sum(rouge_n(r, h, 2) for r, h in zip(refs, hyps)) / n, 4),
+        "rougeL": round(sum(rouge_l(r, h) for r, h in zip(refs, hyps)) / n, 4),
+    }
+
+
+def run_backend(backend: str, texts: list, titles: list, repeat: int) -> dict:
+    """
+    Load `backend`, warm it up, then time `repeat` passes over the fixtures.
+    """
+    engine.SUMMARY_BACKEND = backend
+    start = time.perf_counter()
+    engine.get_summarizer()
+    load_s = time.perf_counter() - start
+    engine.summarize_texts(texts[:1], titles[:1])
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = engine.summarize_texts(texts, titles)
+        best = min(best, time.perf_counter() - start)
+    return {
+        "backend": backend,
+        "load_s": round(load_s, 2),
+        "ms_per_article": round(best * 1000 / len(texts), 1),
+        "articles_per_s": round(len(texts) / best, 2),
+        "summaries": outputs,
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark summarization backends against fp32 torch.")
+    ap.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    ap.add_argument("--repeat", type=int, default=3, help="timed passes per backend; the best is reported")
+    ap.add_argument("--min-rouge-l", type=float, default=0.5, help="fail a backend below this ROUGE-L vs torch")
+    ap.add_argument("--out", default=None, help="write the full report (with summaries) as JSON")
+    args = ap.parse_args()
+
+    with open(FIXTURES, "r", encoding="utf-8") as f:
+        articles = json.load(f)
+    titles = [a["title"] for a in articles]
+    texts = [a["title"] + "\n\n" + a["content"] for a in articles]
+    backends = [REFERENCE] + [b for b in args.backends if b != REFERENCE]
+
+    results, failed = [], False
+    for backend in backends:
+        try:
+            results.append(run_backend(backend, texts, titles, args.repeat))
+        except Exception as e:
+            print(f"  {backend:<11} ERROR  {e}")
+            failed = True
+
+    reference = next((r for r in results if r["backend"] == REFERENCE), None)
+    if reference is None:
+        return 1
+    print(f"  {'backend':<11} {'load':>6} {'ms/art':>8} {'art/s':>7} {'speedup':>8} "
+          f"{'R-1':>6} {'R-2':>6} {'R-L':>6}")
+    for r in results:
+        r.update(rouge(reference["summaries"], r["summaries"]))
+        r["speedup"] = round(reference["ms_per_article"] / r["ms_per_article"], 2)
+        ok = r["rougeL"] >= args.min_rouge_l
+        failed |= not ok
+        print(f"  {r['backend']:<11} {r['load_s']:>5.1f}s {r['ms_per_article']:>8.1f} {r['articles_per_s']:>7.2f} "
+              f"{r['speedup']:>7.2f}x {r['rouge1']:>6.3f} {r['rouge2']:>6.3f} {r['rougeL']:>6.3f}"
+              f"{'' if ok else '  LOW'}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 # pipeline/contracts/checks.py
 import os, json
-from typing import List, Dict
+from typing import Dict, Iterator, List
+from .records import iter_records
 
 class ContractError(Exception):
     pass
@@ -16,6 +17,8 @@ def require_file(path: str, hint: str = "") -> None:
 
 def load_json_array(path: str) -> List[Dict]:
     require_file(path, "Upstream stage may have failed.")
+    if not path.endswith(".json"):
+        return list(iter_json_records(path))
     try:
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
@@ -25,6 +28,29 @@ def load_json_array(path: str) -> List[Dict]:
         raise ContractError(f"[CONTRACT] Expected JSON array in {path}.")
     return data
 
+def iter_json_records(path: str) -> Iterator[Dict]:
+    # Streaming counterpart of load_json_array for .jsonl[.gz|.zst] files
+    require_file(path, "Upstream stage may have failed.")
+    try:
+        for i, rec in enumerate(iter_records(path)):
+            if not isinstance(rec, dict):
+                raise ContractError(f"[CONTRACT] Expected a JSON object at record {i} in {path}.")
+            yield rec
+    except (ValueError, OSError) as e:
+        raise ContractError(f"[CONTRACT] Invalid records in {path}: {e}")
+
+def validate_records(path: str, required: List[str], min_items: int) -> int:
+    # One streaming pass: field check on the first 20 records, count on all of them
+    sample, count = [], 0
+    for rec in iter_json_records(path):
+        if count < 20:
+            sample.append(rec)
+        count += 1
+    ensure_article_fields(sample, required)
+    if count < min_items:
+        raise ContractError(f"[CONTRACT] Too few items in {path}: got {count}, need ≥ {min_items}")
+    return count
+
 def ensure_article_fields(items: List[Dict], required: List[str]) -> None:
     # All items must have the required keys (allow empty string/None values)
     missing_examples = []
@@ -0,0 +1,102 @@
+# pipeline/contracts/records.py
+# Streaming article records: JSON Lines, optionally gzip- or zstd-compressed.
+import os, io, json, gzip
+from typing import Dict, Iterable, Iterator, List
+
+# Suffix every stage uses for its record files; ".jsonl.gz" or ".jsonl.zst" compress
+RECORD_SUFFIX = os.getenv("PIPELINE_RECORD_SUFFIX", ".jsonl")
+RECORD_EXTENSIONS = (".jsonl", ".jsonl.gz", ".jsonl.zst", ".json")
+
+
+def is_record_file(fname: str) -> bool:
+    return fname.endswith(RECORD_EXTENSIONS)
+
+
+def _open_text(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Reading/writing .zst records needs the 'zstandard' package.")
+        raw = open(path, mode + "b")
+        if mode == "r":
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        else:
+            stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def iter_records(path: str) -> Iterator[Dict]:
+    """
+    Yield records one at a time from a .jsonl[.gz|.zst] file.
+
+    Plain .json arrays from older runs are still accepted (loaded whole).
+    A truncated last line, as seen while an upstream writer is mid-flush,
+    is skipped rather than treated as an error.
+    """
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+        return
+    with _open_text(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                if line.endswith("\n"):
+                    raise
+                return
+
+
+def iter_batches(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    batch = []
+    for rec in records:
+        batch.append(rec)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class RecordWriter:
+    """
+    Append-only JSONL writer. Records are flushed every `flush_every` writes,
+    so a downstream reader can start on them before the file is complete.
+    """
+    def __init__(self, path: str, append: bool = False, flush_every: int = 100):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.count = 0
+        self.flush_every = flush_every
+        self._f = _open_text(path, "a" if append else "w")
+
+    def write(self, record: Dict) -> None:
+        self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._f.flush()
+
+    def write_many(self, records: Iterable[Dict]) -> None:
+        for rec in records:
+            self.write(rec)
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_records(path: str, records: Iterable[Dict], append: bool = False) -> int:
+    with RecordWriter(path, append=append) as w:
+        w.write_many(records)
+    return w.count
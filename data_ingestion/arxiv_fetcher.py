@@ -1,23 +1,54 @@
 import arxiv
 from .utils import standardize_article
+from .watermarks import get_watermarks
+from .rate_limit import get_limiter
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
-def fetch_arxiv_papers(query="LLM OR 'Large Language Model' OR 'Artificial Intelligence'", max_results=10):
-    results = []
+def iter_arxiv_papers(query="LLM OR 'Large Language Model' OR 'Artificial Intelligence'", max_items=1000, page_size=100):
+    """
+    Yield arXiv papers newer than the watermark, newest first.
+    """
+    watermarks = get_watermarks()
+    since = watermarks.since_timestamp("arxiv")
+    if since:
+        # Ask arXiv only for papers submitted after the last one we saw
+        query = f"({query}) AND submittedDate:[{since:%Y%m%d%H%M} TO 999912312359]"
+    limiter = get_limiter("arxiv")
+    complete = False
     try:
-        client = arxiv.Client()
-        search = arxiv.Search(query=query, max_results=max_results, sort_by=arxiv.SortCriterion.SubmittedDate)
-        for r in client.results(search):
-            results.append(standardize_article(
-                r.title,
-                r.entry_id,
-                r.summary,
-                r.published.isoformat(),
-                "arXiv"
-            ))
+        client = arxiv.Client(page_size=page_size)
+        offset = 0
+        while offset < max_items:
+            if not limiter.acquire():
+                logger.warning("arXiv rate limit reached; stopping pagination.")
+                return
+            wanted = min(page_size, max_items - offset)
+            search = arxiv.Search(query=query, max_results=offset + wanted, sort_by=arxiv.SortCriterion.SubmittedDate)
+            page = list(client.results(search, offset=offset))
+            for r in page:
+                if since and r.published <= since:
+                    complete = True
+                    return  # newest-first, so everything after this is already known
+                yield standardize_article(
+                    r.title,
+                    r.entry_id,
+                    r.summary,
+                    r.published.isoformat(),
+                    "arXiv"
+                )
+                watermarks.advance("arxiv", timestamp=r.published)
+            if len(page) < wanted:
+                complete = True
+                return
+            offset += len(page)
     except Exception as e:
         logger.exception("arXiv Error")
-    return results
\ No newline at end of file
+    finally:
+        if since and not complete:
+            watermarks.hold("arxiv")
+
+def fetch_arxiv_papers(query="LLM OR 'Large Language Model' OR 'Artificial Intelligence'", max_results=10):
+    return list(iter_arxiv_papers(query, max_items=max_results, page_size=max_results))
\ No newline at end of file
@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+import logging
+from datetime import datetime, timezone
+from .http_client import http_get
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = "storage/http_cache.json"
+
+
+class ValidatorCache:
+    """
+    On-disk map of URL -> {etag, last_modified, parsed, fetched_at}.
+
+    `parsed` is whatever JSON-serializable result the caller derived from the
+    response body, so a 304 can be answered without downloading or parsing.
+    """
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable HTTP cache {self.path}: {e}")
+                self._entries = {}
+        return self._entries
+
+    def get(self, url):
+        with self._lock:
+            return self._load().get(url)
+
+    def put(self, url, etag, last_modified, parsed):
+        with self._lock:
+            self._load()[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "parsed": parsed,
+                "fetched_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+_default_cache = None
+
+
+def get_default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ValidatorCache()
+    return _default_cache
+
+
+def conditional_fetch(url, parse, cache=None, headers=None, **kwargs):
+    """
+    GET `url` with the stored validators and return `parse(response)`.
+
+    On 304 Not Modified the cached parse result is returned without reading
+    the body. A fresh 200 response is parsed and, if the server sent an ETag
+    or Last-Modified, stored for the next run.
+    """
+    cache = cache or get_default_cache()
+    entry = cache.get(url)
+
+    request_headers = dict(headers or {})
+    if entry:
+        if entry.get("etag"):
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = http_get(url, headers=request_headers, **kwargs)
+    if response.status_code == 304 and entry:
+        logger.info(f"Not modified, using cached result: {url}")
+        return entry["parsed"]
+    response.raise_for_status()
+
+    parsed = parse(response)
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        cache.put(url, etag, last_modified, parsed)
+    return parsed
@@ -0,0 +1,83 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .runner import DEFAULT_SOURCE_TIMEOUT
+
+# ─── CONFIGURATION ─────────────────────────────────────────────────────────
+DEFAULT_TIMEOUT  = 10     # seconds; callers may pass a tighter one
+MAX_RETRIES      = 3
+BACKOFF_FACTOR   = 0.5    # sleeps 0.5s, 1s, 2s between retries
+RETRY_STATUSES   = (429, 500, 502, 503, 504)
+POOL_HOSTS       = 32     # number of per-host pools kept alive
+POOL_SIZE        = 8      # keep-alive connections per host
+# Longest single sleep between retries, Retry-After included: all MAX_RETRIES
+# sleeps together take at most half of a source's runner deadline
+RETRY_SLEEP_MAX  = DEFAULT_SOURCE_TIMEOUT / 2 / MAX_RETRIES
+# ────────────────────────────────────────────────────────────────────────────
+
+
+def _accept_encoding():
+    # urllib3 only decodes brotli when one of these packages is installed
+    try:
+        import brotli  # noqa: F401
+        return "gzip, deflate, br"
+    except ImportError:
+        pass
+    try:
+        import brotlicffi  # noqa: F401
+        return "gzip, deflate, br"
+    except ImportError:
+        return "gzip, deflate"
+
+
+class CappedRetry(Retry):
+    """
+    Honours Retry-After only up to RETRY_SLEEP_MAX, so a server asking for
+    minutes can't hold a fetch past its deadline in the runner.
+    """
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, RETRY_SLEEP_MAX)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    retry = CappedRetry(
+        total=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        backoff_max=RETRY_SLEEP_MAX,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept-Encoding": _accept_encoding()})
+    return session
+
+
+def get_session():
+    """
+    Return the process-wide pooled session, creating it on first use.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def http_get(url, timeout=None, **kwargs):
+    """
+    GET through the shared session with keep-alive, retries and the default timeout.
+    """
+    return get_session().get(url, timeout=timeout or DEFAULT_TIMEOUT, **kwargs)
@@ -1,44 +1,101 @@
-from .arxiv_fetcher import fetch_arxiv_papers
-from .reddit_fetcher import fetch_reddit_posts
-from .twitter_fetcher import fetch_twitter_posts
+from .arxiv_fetcher import fetch_arxiv_papers, iter_arxiv_papers
+from .reddit_fetcher import fetch_reddit_posts, iter_reddit_posts
+from .twitter_fetcher import fetch_twitter_posts, iter_twitter_posts
 from .github_trending_fetcher import fetch_github_trending
 from .rss_fetcher import fetch_rss_feeds
-from .newsapi_fetcher import fetch_news_ai_articles
-from .newsdata_fetcher import fetch_newsdata
-from .webzio_fetcher import fetch_webzio
+from .newsapi_fetcher import fetch_news_ai_articles, iter_news_ai_articles
+from .newsdata_fetcher import fetch_newsdata, iter_newsdata
+from .webzio_fetcher import fetch_webzio, iter_webzio
+from .runner import Source, run_sources, format_stats
+from .watermarks import get_watermarks
+from contracts.records import RecordWriter, RECORD_SUFFIX
 from datetime import datetime
-import json
+import argparse
 import os
+import time
 
-def safe_fetch(fetch_function, *args, **kwargs):
+# Item caps per API source in --high-volume mode (per subreddit for Reddit)
+HIGH_VOLUME_LIMITS = {
+    "newsapi": 500,
+    "arxiv": 1000,
+    "reddit": 1000,
+    "twitter": 1000,
+    "newsdata": 500,
+    "webzio": 500,
+}
+# Paging is throttled to provider rate limits, so allow far longer runs
+HIGH_VOLUME_SOURCE_TIMEOUT = 900
+HIGH_VOLUME_RUN_BUDGET = 1200
+
+def build_sources(high_volume=False):
     """
-    Wrapper to safely execute a fetch function and catch exceptions.
+    All ingestion sources, in the order their articles are combined.
     """
-    try:
-        return fetch_function(*args, **kwargs) or []
-    except Exception as e:
-        print(f"Error during {fetch_function.__name__}: {e}")
-        return []
-
-if __name__ == '__main__':
-    combined_data = []
+    if high_volume:
+        limits = HIGH_VOLUME_LIMITS
+        return [
+            Source("newsapi", iter_news_ai_articles, max_items=limits["newsapi"]),
+            Source("arxiv", iter_arxiv_papers, max_items=limits["arxiv"]),
+            Source("reddit", iter_reddit_posts, max_items=limits["reddit"]),
+            Source("twitter", iter_twitter_posts, max_items=limits["twitter"]),
+            Source("github_trending", fetch_github_trending, "python"),
+            Source("rss", fetch_rss_feeds, ["https://www.technologyreview.com/feed/"]),
+            Source("newsdata", iter_newsdata, max_items=limits["newsdata"]),
+            Source("webzio", iter_webzio, max_items=limits["webzio"]),
+        ]
+    return [
+        Source("newsapi", fetch_news_ai_articles),
+        Source("arxiv", fetch_arxiv_papers),
+        Source("reddit", fetch_reddit_posts),
+        Source("twitter", fetch_twitter_posts),
+        Source("github_trending", fetch_github_trending, "python"),
+        Source("rss", fetch_rss_feeds, ["https://www.technologyreview.com/feed/"]),
+        Source("newsdata", fetch_newsdata),
+        Source("webzio", fetch_webzio),
+    ]
 
-    combined_data += safe_fetch(fetch_news_ai_articles)
-    combined_data += safe_fetch(fetch_arxiv_papers)
-    combined_data += safe_fetch(fetch_reddit_posts)
-    combined_data += safe_fetch(fetch_twitter_posts)
-    combined_data += safe_fetch(fetch_github_trending, "python")
-    combined_data += safe_fetch(fetch_rss_feeds, ["https://www.technologyreview.com/feed/"])
-    combined_data += safe_fetch(fetch_newsdata)
-    combined_data += safe_fetch(fetch_webzio)
+def run(full_refresh=False, high_volume=False, on_article=None):
+    """
+    Fetch every source into today's record file. Each article is also passed
+    to `on_article` when given. Returns the number of articles fetched.
+    """
+    watermarks = get_watermarks()
+    watermarks.use_existing = not full_refresh
 
     # Ensure output directory exists
     os.makedirs("data", exist_ok=True)
-    filename = f"data/news_{datetime.now().strftime('%Y-%m-%d')}.json"
+    # Appending keeps earlier same-day runs, which watermarks won't refetch
+    filename = f"data/news_{datetime.now().strftime('%Y-%m-%d')}{RECORD_SUFFIX}"
 
     try:
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(combined_data, f, indent=2, ensure_ascii=False)
-        print(f"Fetched {len(combined_data)} articles. Saved to {filename}.")
+        start = time.perf_counter()
+        with RecordWriter(filename, append=True) as writer:
+            def sink(article):
+                writer.write(article)
+                if on_article is not None:
+                    on_article(article)
+            if high_volume:
+                _, stats = run_sources(build_sources(high_volume=True),
+                                       source_timeout=HIGH_VOLUME_SOURCE_TIMEOUT,
+                                       run_budget=HIGH_VOLUME_RUN_BUDGET,
+                                       sink=sink)
+            else:
+                _, stats = run_sources(build_sources(), sink=sink)
+        print(f"Ingestion finished in {time.perf_counter() - start:.2f}s:\n{format_stats(stats)}")
+        print(f"Fetched {writer.count} articles. Saved to {filename}.")
+        # Only move watermarks forward once the new items are safely on disk,
+        # and only for sources that delivered everything they fetched
+        watermarks.commit([name for name, s in stats.items() if s["status"] == "ok"])
     except Exception as e:
-        print(f"Failed to save articles to {filename}: {e}")
\ No newline at end of file
+        print(f"Failed to save articles to {filename}: {e}")
+        return 0
+    return writer.count
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Fetch articles from all sources.")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="ignore stored watermarks and fetch each source's full window")
+    parser.add_argument("--high-volume", action="store_true",
+                        help="page through the API sources up to HIGH_VOLUME_LIMITS items each")
+    args = parser.parse_args()
+    run(full_refresh=args.full_refresh, high_volume=args.high_volume)
\ No newline at end of file
@@ -1,41 +1,72 @@
-import requests
 from datetime import datetime, timezone
 from .utils import get_env_variable, standardize_article
+from .http_client import http_get
+from .watermarks import get_watermarks
+from .rate_limit import get_limiter
 import logging
 
 logger = logging.getLogger(__name__)
 
-NEWS_API_KEY = get_env_variable("NEWS_API_KEY")
-
-def fetch_news_ai_articles():
-    if not NEWS_API_KEY:
+def iter_news_ai_articles(max_items=500, page_size=100):
+    """
+    Yield NewsAPI headlines newer than the watermark, page by page.
+    """
+    api_key = get_env_variable("NEWS_API_KEY")
+    if not api_key:
         logger.warning("NEWS_API_KEY not found. Skipping NewsAPI.")
-        return []
+        return
 
     query = "AI"
-    url = (
-        f"https://newsapi.org/v2/top-headlines?"
-        f"q={query}&"
-        "language=en&"
-        "category=technology&"
-        f"apiKey={NEWS_API_KEY}"
-    )
-
-    articles_processed = []
+    watermarks = get_watermarks()
+    limiter = get_limiter("newsapi")
+    since = watermarks.since_timestamp("newsapi")
+    page = 1
+    fetched = 0
+    complete = False
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        articles = response.json().get("articles", [])
+        while fetched < max_items:
+            if not limiter.acquire():
+                logger.warning("NewsAPI rate limit reached; stopping pagination.")
+                return
+            url = (
+                f"https://newsapi.org/v2/top-headlines?"
+                f"q={query}&"
+                "language=en&"
+                "category=technology&"
+                f"pageSize={min(page_size, max_items - fetched)}&"
+                f"page={page}&"
+                f"apiKey={api_key}"
+            )
+            response = http_get(url)
+            response.raise_for_status()
+            data = response.json()
+            articles = data.get("articles", [])
+            fetched += len(articles)
 
-        for article in articles:
-            if article.get("title") and article.get("url") and article.get("publishedAt"):
-                articles_processed.append(standardize_article(
-                    article["title"],
-                    article["url"],
-                    article.get("description", "")[:500],
-                    article["publishedAt"],
-                    f"NewsAPI - {article.get('source', {}).get('name', 'Unknown')}"
-                ))
+            fresh = 0
+            for article in articles:
+                if article.get("title") and article.get("url") and article.get("publishedAt"):
+                    if not watermarks.is_new("newsapi", article["publishedAt"]):
+                        continue
+                    fresh += 1
+                    yield standardize_article(
+                        article["title"],
+                        article["url"],
+                        (article.get("description") or "")[:500],
+                        article["publishedAt"],
+                        f"NewsAPI - {article.get('source', {}).get('name', 'Unknown')}"
+                    )
+                    watermarks.advance("newsapi", timestamp=article["publishedAt"])
+            if not articles or not fresh or fetched >= data.get("totalResults", 0):
+                complete = True
+                return
+            page += 1
     except Exception as e:
         logger.exception("NewsAPI Error")
-    return articles_processed
\ No newline at end of file
+    finally:
+        if since and not complete:
+            watermarks.hold("newsapi")
+
+def fetch_news_ai_articles():
+    # One page at the API's default size
+    return list(iter_news_ai_articles(max_items=20, page_size=20))
\ No newline at end of file
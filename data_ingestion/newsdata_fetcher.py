@@ -1,23 +1,54 @@
-import requests
 from .utils import get_env_variable, standardize_article
+from .http_client import http_get
+from .watermarks import get_watermarks
+from .rate_limit import get_limiter
 import logging
 
 logger = logging.getLogger(__name__)
 
-def fetch_newsdata():
+def iter_newsdata(max_items=500):
+    """
+    Yield NewsData articles newer than the watermark, following `nextPage` tokens.
+    """
     api_key = get_env_variable("NEWSDATA_API_KEY")
     if not api_key:
         logger.warning("NEWSDATA_API_KEY not found.")
-        return []
+        return
+    watermarks = get_watermarks()
+    limiter = get_limiter("newsdata")
+    since = watermarks.since_timestamp("newsdata")
+    next_page = None
+    fetched = 0
+    complete = False
     try:
-        url = f"https://newsdata.io/api/1/news?apikey={api_key}&q=artificial%20intelligence&language=en"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        articles = response.json().get("results", [])
-        return [
-            standardize_article(a["title"], a["link"], a.get("content", ""), a["pubDate"], "NewsData.io")
-            for a in articles
-        ]
+        while fetched < max_items:
+            if not limiter.acquire():
+                logger.warning("NewsData rate limit reached; stopping pagination.")
+                return
+            url = f"https://newsdata.io/api/1/news?apikey={api_key}&q=artificial%20intelligence&language=en"
+            if next_page:
+                url += f"&page={next_page}"
+            response = http_get(url)
+            response.raise_for_status()
+            data = response.json()
+            articles = data.get("results", [])[:max_items - fetched]
+            fetched += len(articles)
+
+            fresh = [a for a in articles if watermarks.is_new("newsdata", a["pubDate"])]
+            for a in fresh:
+                yield standardize_article(a["title"], a["link"], a.get("content", ""), a["pubDate"], "NewsData.io")
+                watermarks.advance("newsdata", timestamp=a["pubDate"])
+
+            next_page = data.get("nextPage")
+            if not next_page or not fresh:
+                complete = True
+                return
     except Exception as e:
         logger.exception("NewsData Error")
-        return []
\ No newline at end of file
+    finally:
+        if since and not complete:
+            watermarks.hold("newsdata")
+
+def fetch_newsdata():
+    # One page at the free plan's page size
+    return list(iter_newsdata(max_items=10))
\ No newline at end of file
@@ -1,9 +1,22 @@
 import re
-from datetime import datetime, timezone
-from dateutil import parser as date_parser
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from html.entities import html5, name2codepoint
 from bs4 import BeautifulSoup
+import argparse
 import os
-import json
+try:
+    from .utils import normalize_date
+except ImportError:
+    # Run as a script: add project root to sys.path then import by package
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from data_ingestion.utils import normalize_date
+from contracts.records import RecordWriter, iter_records, iter_batches, RECORD_SUFFIX
+
+# Articles cleaned per batch; bounds memory regardless of input size
+BATCH_SIZE = 500
 
 # 1) A growing list of substrings that commonly appear in “no content” placeholders.
 PLACEHOLDER_PATTERNS = [
@@ -43,27 +56,68 @@ def is_placeholder_content(text: str) -> bool:
 
     return False
 
-# def standardize_iso_date(date_str: str) -> str | None:
-#     """
-#     Parse date_str into UTC ISO 8601 string (YYYY-MM-DDTHH:MM:SSZ).
-#     Returns None if parsing fails.
-#     """
-#     if not date_str:
-#         return None
-#     try:
-#         dt = date_parser.parse(date_str)
-#         if not dt.tzinfo:
-#             dt = dt.replace(tzinfo=timezone.utc)
-#         return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-#     except Exception:
-#         return None
+# Fast path for simple markup: plain start/end tags with well-formed
+# attributes, and entity references that html.parser + BeautifulSoup decode
+# exactly as below. Anything else (comments, CDATA, script/style, stray "<",
+# unusual entities) goes through BeautifulSoup so the output never changes.
+WHITESPACE_REGEX = re.compile(r"\s+")
+SIMPLE_TAG_REGEX = re.compile(
+    r"""</?[A-Za-z][^\s/>]*(?:\s+[^\s"'>/=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'=<>`]+))?)*\s*/?>"""
+)
+RAW_TEXT_TAG_REGEX = re.compile(
+    r"<\s*/?\s*(script|style|template|textarea|title|xmp|plaintext|noscript|iframe|noembed|noframes)\b",
+    flags=re.IGNORECASE
+)
+AMPERSAND_REGEX = re.compile(r"&(?:#([0-9]{1,7});|#[xX]([0-9a-fA-F]{1,6});|([A-Za-z][A-Za-z0-9]*);|(?=\s)|$)")
+
+def _decode_reference(match):
+    decimal, hexadecimal, name = match.groups()
+    if name is not None:
+        # HTML4 names, decoded with their HTML5 meaning as BeautifulSoup does
+        if name not in name2codepoint:
+            raise ValueError(name)
+        return html5[name + ";"]
+    if decimal is None and hexadecimal is None:
+        return "&"  # a bare "&" before whitespace is literal text
+    cp = int(decimal, 10) if decimal is not None else int(hexadecimal, 16)
+    # Control, C1, surrogate and non-character code points are decoded
+    # differently by the two parsers; leave those to BeautifulSoup
+    if cp < 32 or 127 <= cp < 160 or 0xD800 <= cp < 0xE000 or cp > 0x10FFFF \
+            or 0xFDD0 <= cp <= 0xFDEF or (cp & 0xFFFE) == 0xFFFE:
+        raise ValueError(cp)
+    return chr(cp)
+
+def strip_simple_html(raw_html: str) -> str | None:
+    """
+    Strip tags and decode entities without building a parse tree.
+    Returns None when the markup is not simple enough to do that safely.
+    """
+    if "<" in raw_html:
+        if RAW_TEXT_TAG_REGEX.search(raw_html):
+            return None
+        raw_html = SIMPLE_TAG_REGEX.sub("", raw_html)
+        if "<" in raw_html:
+            return None
+    if "&" in raw_html:
+        parts = raw_html.split("&")
+        for part in parts[1:]:
+            if not AMPERSAND_REGEX.match("&" + part):
+                return None
+        try:
+            raw_html = AMPERSAND_REGEX.sub(_decode_reference, raw_html)
+        except ValueError:
+            return None
+    return raw_html
 
 def clean_html(raw_html: str) -> str:
     """
     Remove HTML tags and collapse whitespace.
     """
-    text = BeautifulSoup(raw_html or "", "html.parser").get_text()
-    return re.sub(r"\s+", " ", text).strip()
+    raw_html = raw_html or ""
+    text = strip_simple_html(raw_html)
+    if text is None:
+        text = BeautifulSoup(raw_html, "html.parser").get_text()
+    return WHITESPACE_REGEX.sub(" ", text).strip()
 
 def preprocess_articles(raw_articles: list[dict]) -> list[dict]:
     """
@@ -93,33 +147,63 @@ def preprocess_articles(raw_articles: list[dict]) -> list[dict]:
         if is_placeholder_content(content):
             content = ""
 
-        # # 4) Normalize date
-        # iso_date = date_raw
-        # if not iso_date:
-        #     # If date parsing fails, set it to current UTC time (or skip)
-        #     iso_date = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        # 4) Normalize date to UTC ISO 8601 (kept as-is if unparseable)
+        iso_date = normalize_date(date_raw) or date_raw
 
         # 5) Build final record
         cleaned.append({
             "title": title,
             "url": url_raw.strip(),
             "content": content,
-            "published_date": date_raw,
+            "published_date": iso_date,
             "source_platform": source
         })
 
     return cleaned
 
+def iter_preprocessed(raw_articles, workers: int | None = None, chunk_size: int = BATCH_SIZE):
+    """
+    Clean a stream of raw articles chunk by chunk across a process pool,
+    yielding records in input order. Only a couple of chunks per worker are
+    in flight, so memory stays bounded by the chunk size.
+    """
+    chunks = iter_batches(raw_articles, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            yield from preprocess_articles(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(preprocess_articles, chunk))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+def preprocess_articles_parallel(raw_articles: list[dict], workers: int | None = None,
+                                 chunk_size: int = BATCH_SIZE) -> list[dict]:
+    """
+    Same output as preprocess_articles, computed in parallel chunks.
+    """
+    return list(iter_preprocessed(raw_articles, workers, chunk_size))
+
 if __name__ == '__main__':
-    
-    with open(f"data/news_{datetime.now().strftime('%Y-%m-%d')}", "r", encoding="utf-8") as out_f:
-        data = json.load(out_f)
+    parser = argparse.ArgumentParser(description="Clean today's raw articles.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="preprocessing processes (default: CPU count; 1 disables the pool)")
+    args = parser.parse_args()
 
-    cleaned_data=preprocess_articles(data)
+    today = datetime.now().strftime('%Y-%m-%d')
+    in_path = f"data/news_{today}{RECORD_SUFFIX}"
+    if not os.path.exists(in_path):
+        in_path = f"data/news_{today}.json"  # written by older runs
 
-    filename = f"data/cleaned_news_{datetime.now().strftime('%Y-%m-%d')}.json"
+    filename = f"data/cleaned_news_{today}{RECORD_SUFFIX}"
 
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(cleaned_data, f, indent=2, ensure_ascii=False)
+    with RecordWriter(filename) as writer:
+        writer.write_many(iter_preprocessed(iter_records(in_path), args.workers))
 
-    print(f"Fetched {len(cleaned_data)} articles. Saved to {filename}.")
\ No newline at end of file
+    print(f"Fetched {writer.count} articles. Saved to {filename}.")
\ No newline at end of file
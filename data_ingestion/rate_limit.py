@@ -0,0 +1,65 @@
+import threading
+import time
+
+# Documented provider limits as (requests per second, burst size)
+RATE_LIMITS = {
+    "arxiv":    (1 / 3, 1),         # arXiv API terms: one request every 3 seconds
+    "reddit":   (100 / 60, 10),     # OAuth clients: 100 queries per minute
+    "twitter":  (60 / 900, 5),      # recent search, Basic tier: 60 requests / 15 min
+    "newsapi":  (100 / 86400, 10),  # Developer plan: 100 requests per day
+    "newsdata": (30 / 900, 5),      # free plan: 30 credits / 15 min
+    "webzio":   (1, 1),             # Lite API: 1 request per second
+}
+
+# Longest a paginating fetcher will block for a token before it stops paging
+MAX_WAIT = 30
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`.
+    """
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1, max_wait=MAX_WAIT):
+        """
+        Block until `tokens` are available and take them.
+
+        Returns False without taking anything if that would mean waiting
+        longer than `max_wait` seconds (None waits indefinitely).
+        """
+        with self._lock:
+            self._refill()
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return False
+            # Reserve now so concurrent callers queue up behind us
+            self._tokens -= tokens
+        if wait:
+            time.sleep(wait)
+        return True
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider):
+    """
+    The shared bucket for `provider`, created from RATE_LIMITS on first use.
+    """
+    with _limiters_lock:
+        if provider not in _limiters:
+            rate, capacity = RATE_LIMITS[provider]
+            _limiters[provider] = TokenBucket(rate, capacity)
+        return _limiters[provider]
@@ -1,31 +1,65 @@
 import praw
 from datetime import datetime, timezone
 from .utils import get_env_variable, standardize_article
+from .watermarks import get_watermarks
+from .rate_limit import get_limiter
 import logging
 
 logger = logging.getLogger(__name__)
 
-def fetch_reddit_posts(subreddits=["MachineLearning", "singularity", "artificial", "LocalLLaMA"], limit=5):
+def iter_reddit_posts(subreddits=["MachineLearning", "singularity", "artificial", "LocalLLaMA"], max_items=1000, page_size=100):
+    """
+    Yield up to `max_items` posts per subreddit newer than its watermark.
+    """
     client_id = get_env_variable("REDDIT_CLIENT_ID")
     client_secret = get_env_variable("REDDIT_CLIENT_SECRET")
     user_agent = get_env_variable("REDDIT_USER_AGENT")
 
     if not all([client_id, client_secret, user_agent]):
         logger.warning("Missing Reddit API credentials.")
-        return []
+        return
 
     reddit = praw.Reddit(client_id=client_id, client_secret=client_secret, user_agent=user_agent)
-    posts = []
+    watermarks = get_watermarks()
+    limiter = get_limiter("reddit")
     for sub in subreddits:
+        source = f"reddit:{sub}"
+        since = watermarks.since_timestamp(source)
+        after = None
+        fetched = 0
+        complete = False
         try:
-            for post in reddit.subreddit(sub).new(limit=limit):
-                posts.append(standardize_article(
-                    post.title,
-                    f"https://www.reddit.com{post.permalink}",
-                    post.selftext if post.is_self else post.url,
-                    datetime.fromtimestamp(post.created_utc, tz=timezone.utc).isoformat(),
-                    f"Reddit - r/{sub}"
-                ))
+            while fetched < max_items:
+                if not limiter.acquire():
+                    logger.warning(f"Reddit rate limit reached; stopping r/{sub}.")
+                    break
+                wanted = min(page_size, max_items - fetched)
+                params = {"after": after} if after else {}
+                page = list(reddit.subreddit(sub).new(limit=wanted, params=params))
+                reached_known = False
+                for post in page:
+                    created = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
+                    if since and created <= since:
+                        reached_known = True  # listing is newest-first; the rest was seen last run
+                        break
+                    fetched += 1
+                    yield standardize_article(
+                        post.title,
+                        f"https://www.reddit.com{post.permalink}",
+                        post.selftext if post.is_self else post.url,
+                        created.isoformat(),
+                        f"Reddit - r/{sub}"
+                    )
+                    watermarks.advance(source, timestamp=created)
+                if reached_known or len(page) < wanted:
+                    complete = True
+                    break
+                after = page[-1].name
         except Exception as e:
             logger.exception(f"Reddit r/{sub} Error")
-    return posts
\ No newline at end of file
+        finally:
+            if since and not complete:
+                watermarks.hold(source)
+
+def fetch_reddit_posts(subreddits=["MachineLearning", "singularity", "artificial", "LocalLLaMA"], limit=5):
+    return list(iter_reddit_posts(subreddits, max_items=limit, page_size=limit))
\ No newline at end of file
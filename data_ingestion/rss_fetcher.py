@@ -1,27 +1,43 @@
 import feedparser
 from datetime import datetime, timezone
-import time
 from .utils import standardize_article
+from .http_cache import conditional_fetch
+from .watermarks import get_watermarks
 import logging
 
 logger = logging.getLogger(__name__)
 
+def parse_feed(response):
+    """
+    Parse an RSS/Atom response into standardized articles.
+    """
+    headers = {"content-location": response.url}
+    headers.update((k.lower(), v) for k, v in response.headers.items())
+    feed = feedparser.parse(response.content, response_headers=headers)
+    articles = []
+    for entry in feed.entries:
+        # Raw RFC 822/ISO string; standardize_article normalizes it to UTC
+        published = (getattr(entry, 'published', None) or getattr(entry, 'updated', None)
+                     or datetime.now(timezone.utc).isoformat())
+        articles.append(standardize_article(
+            getattr(entry, 'title', 'No title'),
+            getattr(entry, 'link', ''),
+            getattr(entry, 'summary', '')[:1000],
+            published,
+            f"RSS - {feed.feed.get('title', response.url)}"
+        ))
+    return articles
+
 def fetch_rss_feeds(urls):
     all_articles = []
+    watermarks = get_watermarks()
     for url in urls:
+        source = f"rss:{url}"
         try:
-            feed = feedparser.parse(url)
-            for entry in feed.entries:
-                published = datetime.now(timezone.utc).isoformat()
-                if hasattr(entry, 'published_parsed'):
-                    published = datetime.fromtimestamp(time.mktime(entry.published_parsed), tz=timezone.utc).isoformat()
-                all_articles.append(standardize_article(
-                    getattr(entry, 'title', 'No title'),
-                    getattr(entry, 'link', ''),
-                    getattr(entry, 'summary', '')[:1000],
-                    published,
-                    f"RSS - {feed.feed.get('title', url)}"
-                ))
+            for article in conditional_fetch(url, parse_feed):
+                if watermarks.is_new(source, article["published_date"]):
+                    watermarks.advance(source, timestamp=article["published_date"])
+                    all_articles.append(article)
         except Exception as e:
             logger.exception(f"RSS Error ({url})")
     return all_articles
\ No newline at end of file
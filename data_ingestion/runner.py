@@ -0,0 +1,178 @@
+import time
+import threading
+import logging
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+# Per-source deadline and overall budget for one ingestion run (seconds)
+DEFAULT_SOURCE_TIMEOUT = 60
+DEFAULT_RUN_BUDGET = 180
+
+
+class Source:
+    """
+    A named fetch call: `fetch_function(*args, **kwargs)` with its own deadline.
+    """
+    def __init__(self, name, fetch_function, *args, timeout=None, **kwargs):
+        self.name = name
+        self.fetch_function = fetch_function
+        self.args = args
+        self.kwargs = kwargs
+        self.timeout = timeout
+
+    def __call__(self):
+        return self.fetch_function(*self.args, **self.kwargs) or []
+
+
+class SinkClosed(Exception):
+    """
+    Raised into a source that is still producing after run_sources returned.
+    """
+
+
+def _timed_call(source, sink, progress, cancelled):
+    start = time.perf_counter()
+    items = []
+    iterator = iter(source())
+    # Check before pulling: an item the generator has produced must be kept
+    while not cancelled.is_set():
+        try:
+            item = next(iterator)
+        except StopIteration:
+            break
+        if sink is None:
+            items.append(item)
+        else:
+            sink(item)
+        progress[source.name] += 1
+    return items, time.perf_counter() - start
+
+
+def _start(source, sink, progress, cancelled, slots):
+    """
+    Run one source on a daemon thread; returns a Future for its result.
+    Daemon threads don't hold up interpreter exit, so a source stuck in a
+    network call can't outlive the run budget by keeping the process alive.
+    """
+    future = Future()
+
+    def target():
+        with slots:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(_timed_call(source, sink, progress, cancelled))
+            except BaseException as e:
+                future.set_exception(e)
+
+    threading.Thread(target=target, name=f"ingest-{source.name}", daemon=True).start()
+    return future
+
+
+def run_sources(sources, max_workers=None, source_timeout=DEFAULT_SOURCE_TIMEOUT,
+                run_budget=DEFAULT_RUN_BUDGET, sink=None):
+    """
+    Run all sources in parallel threads and collect their articles.
+
+    A source that raises, or that has not finished by its deadline (its own
+    `timeout`, else `source_timeout`) or by the end of the run budget, is
+    recorded with status "error"/"timeout" and contributes no articles.
+    Results are combined in the order the sources were given.
+
+    With a `sink`, each article is passed to `sink(article)` as soon as its
+    source yields it (calls are serialized) and nothing is kept in memory;
+    the returned list is then empty. A timed-out source stops streaming at
+    its deadline but keeps whatever it already delivered.
+
+    run_sources returns by the run budget. A source still blocked in a call
+    at that point keeps its thread until the call returns; it can no longer
+    deliver articles, and its daemon thread never delays process exit.
+
+    Returns (articles, stats) where stats maps source name to
+    {"status", "count", "seconds"}.
+    """
+    sink_lock = threading.Lock()
+    sink_open = [True]
+    if sink is not None:
+        unlocked_sink = sink
+
+        def sink(item):
+            # Stragglers past the deadline must not write after we return
+            with sink_lock:
+                if not sink_open[0]:
+                    raise SinkClosed(item.get("url", ""))
+                unlocked_sink(item)
+
+    sources = list(sources)
+    results = {s.name: [] for s in sources}
+    progress = {s.name: 0 for s in sources}
+    cancelled = {s.name: threading.Event() for s in sources}
+    stats = {}
+
+    slots = threading.BoundedSemaphore(max_workers or len(sources) or 1)
+    run_start = time.perf_counter()
+    run_deadline = run_start + run_budget
+    futures = {}
+    deadlines = {}
+    for source in sources:
+        future = _start(source, sink, progress, cancelled[source.name], slots)
+        futures[future] = source
+        deadlines[future] = min(run_start + (source.timeout or source_timeout), run_deadline)
+
+    pending = set(futures)
+    try:
+        while pending:
+            now = time.perf_counter()
+            for future in [f for f in pending if deadlines[f] <= now]:
+                pending.discard(future)
+                source = futures[future]
+                future.cancel()
+                cancelled[source.name].set()
+                kept = progress[source.name] if sink is not None else 0
+                stats[source.name] = {"status": "timeout", "count": kept,
+                                      "seconds": round(now - run_start, 3)}
+                logger.warning(f"{source.name} exceeded its deadline; stopped waiting for it.")
+            if not pending:
+                break
+
+            next_deadline = min(deadlines[f] for f in pending)
+            done, pending = wait(pending, timeout=max(0.0, next_deadline - now),
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                source = futures[future]
+                try:
+                    items, seconds = future.result()
+                except Exception as e:
+                    logger.warning(f"Error during {source.name}: {e}")
+                    kept = progress[source.name] if sink is not None else 0
+                    stats[source.name] = {"status": "error", "count": kept,
+                                          "seconds": round(time.perf_counter() - run_start, 3)}
+                    continue
+                results[source.name] = items
+                stats[source.name] = {"status": "ok", "count": progress[source.name],
+                                      "seconds": round(seconds, 3)}
+    finally:
+        # Don't block on stragglers: they stop at their next item or at exit
+        for future, source in futures.items():
+            future.cancel()
+            cancelled[source.name].set()
+        with sink_lock:
+            sink_open[0] = False
+
+    combined = []
+    for source in sources:
+        combined += results[source.name]
+    return combined, stats
+
+
+def format_stats(stats):
+    """
+    Render per-source stats as one line per source, slowest first.
+    """
+    rows = sorted(stats.items(), key=lambda kv: kv[1]["seconds"], reverse=True)
+    width = max((len(name) for name in stats), default=0)
+    return "\n".join(
+        f"  {name:<{width}}  {s['status']:<7} {s['count']:>5} items  {s['seconds']:>7.2f}s"
+        for name, s in rows
+    )
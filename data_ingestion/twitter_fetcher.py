@@ -1,29 +1,74 @@
 import tweepy
-from datetime import timezone
+from datetime import datetime, timedelta, timezone
 from .utils import get_env_variable, standardize_article
+from .watermarks import get_watermarks
+from .rate_limit import get_limiter
 import logging
 
 logger = logging.getLogger(__name__)
 
-BEARER_TOKEN = get_env_variable("TWITTER_BEARER_TOKEN")
+# Recent search only reaches back 7 days and rejects a since_id or
+# start_time before that; the margin covers clock skew and request latency
+SEARCH_WINDOW = timedelta(days=7)
+WINDOW_MARGIN = timedelta(minutes=1)
 
-def fetch_twitter_posts(query="AI OR #ArtificialIntelligence OR #LLM -is:retweet lang:en", max_results=10):
-    if not BEARER_TOKEN:
+def resume_params(mark, last_seen, now):
+    """
+    Search parameters that resume after the stored tweet: its since_id while
+    it is inside the search window, else a start_time no earlier than the window.
+    """
+    if last_seen is None:
+        return {}
+    window_start = now - SEARCH_WINDOW + WINDOW_MARGIN
+    if mark.get("id") and last_seen > window_start:
+        return {"since_id": mark["id"]}
+    return {"start_time": max(last_seen, window_start)}
+
+def iter_twitter_posts(query="AI OR #ArtificialIntelligence OR #LLM -is:retweet lang:en", max_items=1000, page_size=100):
+    """
+    Yield tweets newer than the watermark, following next_token pages.
+    """
+    bearer_token = get_env_variable("TWITTER_BEARER_TOKEN")
+    if not bearer_token:
         logger.warning("Missing Twitter Bearer Token.")
-        return []
+        return
+    watermarks = get_watermarks()
+    extra = {}
+    complete = False
     try:
-        client = tweepy.Client(bearer_token=BEARER_TOKEN)
-        response = client.search_recent_tweets(query=query, max_results=max_results, tweet_fields=["created_at", "author_id", "text"])
-        tweets = []
-        for tweet in response.data or []:
-            tweets.append(standardize_article(
-                f"Tweet by {tweet.author_id}: {tweet.text[:70]}...",
-                f"https://twitter.com/{tweet.author_id}/status/{tweet.id}",
-                tweet.text,
-                tweet.created_at.replace(tzinfo=timezone.utc).isoformat(),
-                "Twitter/X"
-            ))
-        return tweets
+        extra.update(resume_params(watermarks.since("twitter") or {}, watermarks.since_timestamp("twitter"),
+                                   datetime.now(timezone.utc)))
+
+        client = tweepy.Client(bearer_token=bearer_token)
+        limiter = get_limiter("twitter")
+        fetched = 0
+        while fetched < max_items:
+            if not limiter.acquire():
+                logger.warning("Twitter rate limit reached; stopping pagination.")
+                return
+            # The endpoint accepts 10-100 results per page
+            page_max = max(10, min(page_size, max_items - fetched, 100))
+            response = client.search_recent_tweets(query=query, max_results=page_max, tweet_fields=["created_at", "author_id", "text"], **extra)
+            for tweet in (response.data or [])[:max_items - fetched]:
+                fetched += 1
+                yield standardize_article(
+                    f"Tweet by {tweet.author_id}: {tweet.text[:70]}...",
+                    f"https://twitter.com/{tweet.author_id}/status/{tweet.id}",
+                    tweet.text,
+                    tweet.created_at.replace(tzinfo=timezone.utc).isoformat(),
+                    "Twitter/X"
+                )
+                watermarks.advance("twitter", timestamp=tweet.created_at, item_id=tweet.id)
+            next_token = (response.meta or {}).get("next_token")
+            if not next_token or not response.data:
+                complete = True
+                return
+            extra["next_token"] = next_token
     except Exception as e:
         logger.exception("Twitter Error")
-        return []
\ No newline at end of file
+    finally:
+        if ("since_id" in extra or "start_time" in extra) and not complete:
+            watermarks.hold("twitter")
+
+def fetch_twitter_posts(query="AI OR #ArtificialIntelligence OR #LLM -is:retweet lang:en", max_results=10):
+    return list(iter_twitter_posts(query, max_items=max_results, page_size=max_results))
\ No newline at end of file
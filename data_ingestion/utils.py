@@ -1,39 +1,100 @@
 import os
-from datetime import datetime
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from dateutil import parser as date_parser
 from dotenv import load_dotenv
 from pathlib import Path
 
-# Load environment variables from .env file safely
-try:
-    dotenv_path = Path("..") / ".env"
-    if dotenv_path.exists():
-        load_dotenv(dotenv_path=dotenv_path)
-    else:
-        print(f"Warning: .env file not found at {dotenv_path}")
-except Exception as e:
-    print(f"Error loading .env file: {e}")
+@lru_cache(maxsize=None)
+def load_env():
+    """
+    Load environment variables from the .env file safely, once per process.
+    """
+    try:
+        dotenv_path = Path("..") / ".env"
+        if dotenv_path.exists():
+            load_dotenv(dotenv_path=dotenv_path)
+        else:
+            print(f"Warning: .env file not found at {dotenv_path}")
+    except Exception as e:
+        print(f"Error loading .env file: {e}")
 
 def get_env_variable(key):
     """
-    Safely get an environment variable.
+    Safely get an environment variable, loading .env on first use.
     """
+    load_env()
     value = os.getenv(key)
     if not value:
         print(f"Environment variable '{key}' not found.")
     return value
 
+# Tried in order after ISO 8601 and RFC 822, before falling back to dateutil
+KNOWN_DATE_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",      # NewsData.io pubDate
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%d %b %Y %H:%M:%S",
+    "%b %d, %Y",
+)
+# Unix epoch seconds (9+ digits, so bare years and dates stay with the parsers)
+EPOCH_REGEX = re.compile(r"\d{9,}(\.\d+)?")
+
+@lru_cache(maxsize=65536)
+def normalize_date(raw):
+    """
+    Parse a date string or Unix epoch seconds from any source into a UTC
+    ISO 8601 timestamp (naive times are taken as UTC). Returns None if it
+    can't be parsed. Cached by raw value, since feeds repeat the same
+    timestamps a lot.
+    """
+    raw = "" if raw is None else str(raw).strip()
+    if not raw:
+        return None
+    dt = None
+    if EPOCH_REGEX.fullmatch(raw):
+        try:
+            return datetime.fromtimestamp(float(raw), tz=timezone.utc).isoformat()
+        except (ValueError, OverflowError, OSError):
+            return None
+    try:
+        dt = datetime.fromisoformat(raw.replace('Z', '+00:00'))
+    except ValueError:
+        pass
+    if dt is None and "," in raw[:5]:
+        # RFC 822, as used by RSS: "Mon, 11 Aug 2025 10:00:00 GMT"
+        try:
+            dt = parsedate_to_datetime(raw)
+        except (TypeError, ValueError):
+            pass
+    if dt is None:
+        for fmt in KNOWN_DATE_FORMATS:
+            try:
+                dt = datetime.strptime(raw, fmt)
+                break
+            except ValueError:
+                continue
+    if dt is None:
+        try:
+            dt = date_parser.parse(raw)
+        except (ValueError, OverflowError):
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat()
+
 def standardize_article(title, url, content, published_date, source):
     """
     Standardizes article metadata for consistent storage/processing.
     """
-    try:
-        if published_date:
-            published_date = datetime.fromisoformat(
-                published_date.replace('Z', '+00:00')
-            ).isoformat()
-    except Exception as e:
-        print(f"Date parsing error for '{published_date}': {e}. Using current UTC time.")
-        published_date = datetime.utcnow().isoformat()
+    if published_date:
+        normalized = normalize_date(published_date)
+        if normalized is None:
+            print(f"Date parsing error for '{published_date}'. Using current UTC time.")
+            normalized = datetime.now(timezone.utc).isoformat()
+        published_date = normalized
 
     return {
         "title": title or "Untitled",
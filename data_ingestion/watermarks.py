@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+import logging
+from datetime import datetime, timezone
+from .utils import normalize_date
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_PATH = "storage/watermarks.json"
+
+
+def to_utc(value):
+    """
+    Coerce a datetime or date string to an aware UTC datetime (naive = UTC).
+    Returns None if it can't be parsed.
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = normalize_date(value)
+        if value is None:
+            return None
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class WatermarkStore:
+    """
+    Per-source high-water marks: {"timestamp": ISO str, "id": str, "cursor": str}.
+
+    The contract every paginated fetcher follows:
+    - Read the mark with `since()` and skip items that aren't newer.
+    - Call `advance()` for an item only after yielding it, so the mark never
+      moves past an item the consumer didn't take.
+    - If the item cap, the rate limit or an error stops paging before the
+      results reach the mark, call `hold()`: advancing would skip the items
+      between the mark and the oldest one fetched.
+    Advances are only staged; `commit()` persists them for the sources whose
+    output is safely written, so a failed or timed-out source re-fetches its
+    window.
+    """
+    def __init__(self, path=WATERMARK_PATH):
+        self.path = path
+        self.use_existing = True
+        self._lock = threading.Lock()
+        self._marks = None
+        self._pending = {}
+        self._held = set()
+
+    def _load(self):
+        if self._marks is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._marks = json.load(f)
+            except FileNotFoundError:
+                self._marks = {}
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable watermark file {self.path}: {e}")
+                self._marks = {}
+        return self._marks
+
+    def since(self, source):
+        """
+        The committed watermark for `source`, or None on a first or full run.
+        """
+        if not self.use_existing:
+            return None
+        with self._lock:
+            return self._load().get(source)
+
+    def since_timestamp(self, source):
+        mark = self.since(source)
+        return to_utc(mark.get("timestamp")) if mark else None
+
+    def is_new(self, source, published):
+        """
+        True if `published` is strictly after the source's timestamp watermark.
+        """
+        mark = self.since_timestamp(source)
+        if mark is None:
+            return True
+        published = to_utc(published)
+        return published is None or published > mark
+
+    def advance(self, source, timestamp=None, item_id=None, cursor=None):
+        """
+        Stage a newer watermark for `source`; older values are ignored.
+        """
+        with self._lock:
+            if source in self._held:
+                return
+            mark = self._pending.setdefault(source, dict(self._load().get(source) or {}))
+            ts = to_utc(timestamp)
+            if ts is not None:
+                current = to_utc(mark.get("timestamp"))
+                if current is None or ts > current:
+                    mark["timestamp"] = ts.isoformat()
+            if item_id is not None:
+                current = mark.get("id")
+                if current is None or int(item_id) > int(current):
+                    mark["id"] = str(item_id)
+            if cursor is not None:
+                mark["cursor"] = cursor
+
+    def hold(self, source):
+        """
+        Keep the committed mark for `source` this run, dropping staged advances.
+        """
+        with self._lock:
+            self._held.add(source)
+            self._pending.pop(source, None)
+
+    def commit(self, sources=None):
+        """
+        Persist staged advances, only for `sources` if given. A name also
+        covers its sub-sources ("reddit" covers "reddit:MachineLearning").
+        """
+        with self._lock:
+            def included(key):
+                return sources is None or any(key == s or key.startswith(f"{s}:") for s in sources)
+            staged = {k: v for k, v in self._pending.items() if included(k)}
+            self._pending = {}
+            self._held = set()
+            if not staged:
+                return
+            marks = self._load()
+            marks.update(staged)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(marks, f, indent=2)
+            os.replace(tmp, self.path)
+
+
+_default_store = None
+
+
+def get_watermarks():
+    global _default_store
+    if _default_store is None:
+        _default_store = WatermarkStore()
+    return _default_store
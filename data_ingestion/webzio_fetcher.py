@@ -1,40 +1,69 @@
-import requests
 from .utils import get_env_variable, standardize_article
+from .http_client import http_get
+from .watermarks import get_watermarks
+from .rate_limit import get_limiter
 import logging
 
 logger = logging.getLogger(__name__)
 
-def fetch_webzio():
+WEBZIO_BASE = "https://api.webz.io"
+
+def iter_webzio(max_items=500, page_size=100):
+    """
+    Yield Webz.io posts newer than the watermark, following `next` links.
+    """
     api_key = get_env_variable("WEBZIO_API_KEY")
     if not api_key:
         logger.warning("WEBZIO_API_KEY not found.")
-        return []
+        return
 
+    watermarks = get_watermarks()
+    limiter = get_limiter("webzio")
+    url = f"{WEBZIO_BASE}/newsApiLite?token={api_key}&q=AI&size={min(page_size, max_items)}&sort=desc&from=3d"
+    since = watermarks.since_timestamp("webzio")
+    fetched = 0
+    complete = False
     try:
-        url = f"https://api.webz.io/newsApiLite?token={api_key}&q=AI&size=5&sort=desc&from=3d"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        posts = data.get("posts", [])
-        if not posts:
-            logger.info("No posts found in Webz.io response.")
-            return []
-
-        articles = []
-        for post in posts:
-            title = post.get("title") or post.get("thread", {}).get("title") or "No title"
-            url = post.get("url") or post.get("thread", {}).get("url") or ""
-            content = post.get("text", "")
-            published = post.get("published") or post.get("thread", {}).get("published") or ""
-
-            try:
-                article = standardize_article(title, url, content, published[:19], "webjio.io")
-                articles.append(article)
-            except Exception as e:
-                logger.exception("Error standardizing article")
-
-        return articles
+        while url and fetched < max_items:
+            if not limiter.acquire():
+                logger.warning("Webz.io rate limit reached; stopping pagination.")
+                return
+            response = http_get(url)
+            response.raise_for_status()
+            data = response.json()
+
+            posts = data.get("posts", [])[:max_items - fetched]
+            if not posts:
+                if not fetched:
+                    logger.info("No posts found in Webz.io response.")
+                complete = True
+                return
+            fetched += len(posts)
+
+            for post in posts:
+                title = post.get("title") or post.get("thread", {}).get("title") or "No title"
+                post_url = post.get("url") or post.get("thread", {}).get("url") or ""
+                content = post.get("text", "")
+                published = post.get("published") or post.get("thread", {}).get("published") or ""
+                if not watermarks.is_new("webzio", published):
+                    continue
+
+                try:
+                    article = standardize_article(title, post_url, content, published, "webjio.io")
+                except Exception as e:
+                    logger.exception("Error standardizing article")
+                    continue
+                yield article
+                watermarks.advance("webzio", timestamp=published)
+
+            next_path = data.get("next")
+            url = f"{WEBZIO_BASE}{next_path}" if next_path and data.get("moreResultsAvailable") else None
+        complete = url is None
     except Exception as e:
         logger.exception("Webz.io Error")
-        return []
\ No newline at end of file
+    finally:
+        if since and not complete:
+            watermarks.hold("webzio")
+
+def fetch_webzio():
+    return list(iter_webzio(max_items=5, page_size=5))
\ No newline at end of file
@@ -0,0 +1,55 @@
+# pipeline/deduplication/categories.py
+# Newsletter sections and their prototype descriptions. Dedup embeds the
+# prototypes with the same model as the articles and stores one centroid per
+# section next to its output, which rendering scores the stories against.
+# Changing a prototype changes dedup's fingerprint, so the centroids follow.
+
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+CATEGORY_PROTOTYPES: Dict[str, List[str]] = {
+    "PRODUCT": [
+        "Company launches a new AI product for customers",
+        "New features announced for an AI assistant app",
+        "Tech giant releases an updated chatbot and pricing plans",
+        "Startup ships a beta version of its AI platform",
+    ],
+    "AI RESEARCH": [
+        "Researchers publish a paper on a new machine learning method",
+        "Study evaluates large language models on a benchmark",
+        "arXiv preprint proposes a neural network architecture",
+        "New training technique improves model accuracy in experiments",
+    ],
+    "OPEN SOURCE": [
+        "Open-source library released on GitHub",
+        "Developers publish model weights under a permissive licence",
+        "Trending repository adds a new framework for building AI apps",
+        "Community project releases open code and datasets",
+    ],
+    "POLICY": [
+        "Government passes a law regulating artificial intelligence",
+        "Regulators publish rules for AI safety and transparency",
+        "Lawsuit over copyright and AI training data",
+        "Lawmakers debate AI policy, privacy and export controls",
+    ],
+    "TOOLS": [
+        "Tutorial on using an AI tool to automate a workflow",
+        "Developer tool integrates AI code completion",
+        "Tips for writing prompts and using AI assistants productively",
+        "Plugin connects language models to spreadsheets and documents",
+    ],
+}
+
+
+def build_centroids(encode: Callable[[List[str]], np.ndarray]) -> Tuple[List[str], np.ndarray]:
+    """
+    One L2-normalized centroid per category from its prototype embeddings.
+    `encode` maps texts to normalized embeddings (e.g. dedup's encode_texts).
+    """
+    names = list(CATEGORY_PROTOTYPES)
+    embs = encode([text for name in names for text in CATEGORY_PROTOTYPES[name]])
+    bounds = np.cumsum([0] + [len(CATEGORY_PROTOTYPES[name]) for name in names])
+    centroids = np.vstack([embs[start:end].mean(axis=0) for start, end in zip(bounds[:-1], bounds[1:])])
+    centroids /= np.linalg.norm(centroids, axis=1, keepdims=True)
+    return names, centroids.astype(np.float32)
@@ -1,25 +1,32 @@
 # pipeline/deduplication/data_loader.py
 
 import os
-import json
+from contracts.records import iter_records, is_record_file
+
+def article_text(art: dict) -> str:
+    """
+    The text we embed for an article: title plus content, if any.
+    """
+    title = art.get("title", "").strip()
+    content = art.get("content", "").strip()
+    text = title
+    if content:
+        text += "  " + content
+    return text
+
+def iter_articles(folder_path: str):
+    """
+    Stream every article from the record files (.json/.jsonl[.gz|.zst])
+    in folder_path, one file after another in name order.
+    """
+    for fname in sorted(os.listdir(folder_path)):
+        if not is_record_file(fname):
+            continue
+        yield from iter_records(os.path.join(folder_path, fname))
 
 def load_texts_from_json(folder_path: str):
     """
     Read all JSON files in folder_path, extract and return a list of texts
     (title + content) for embedding.
     """
-    texts = []
-    for fname in os.listdir(folder_path):
-        if not fname.endswith(".json"):
-            continue
-        path = os.path.join(folder_path, fname)
-        with open(path, "r", encoding="utf-8") as f:
-            articles = json.load(f)
-            for art in articles:
-                title = art.get("title", "").strip()
-                content = art.get("content", "").strip()
-                text = title
-                if content:
-                    text += "  " + content
-                texts.append(text)
-    return texts
+    return [article_text(art) for art in iter_articles(folder_path)]
@@ -0,0 +1,149 @@
+# pipeline/deduplication/embedding_cache.py
+# Content-addressed, append-only on-disk cache of sentence embeddings.
+#
+# Layout per model under CACHE_DIR/<model>/:
+#   meta.json    {"model", "dim", "dtype"}
+#   vectors.bin  raw row-major matrix, memory-mapped for reads
+#   keys.txt     one key per line; line i names row i
+#
+# The articles a dedup run kept are also saved by URL to ARTICLE_EMBEDDINGS,
+# so later stages can use their embeddings without loading the model.
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+CACHE_DIR = "deduplication/embedding_cache"
+ARTICLE_EMBEDDINGS = "deduplication/unique_embeddings.npz"
+
+
+def text_key(text: str, model_name: str) -> str:
+    """
+    Cache key for `text` under `model_name`. Whitespace is collapsed first,
+    since it never changes a sentence-transformer embedding.
+    """
+    norm = " ".join((text or "").split())
+    return hashlib.sha1(f"{model_name}\0{norm}".encode("utf-8")).hexdigest()
+
+
+def cached_dim(model_name: str, cache_dir: str = CACHE_DIR) -> Optional[int]:
+    """
+    Embedding size recorded in the cache for `model_name`, or None if there is
+    no cache yet.
+    """
+    meta_path = os.path.join(cache_dir, model_name.replace("/", "__"), "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        return int(json.load(f)["dim"])
+
+
+class EmbeddingCache:
+    def __init__(self, model_name: str, dim: int, cache_dir: str = CACHE_DIR, dtype: str = "float16"):
+        self.dir = os.path.join(cache_dir, model_name.replace("/", "__"))
+        os.makedirs(self.dir, exist_ok=True)
+        self.vectors_path = os.path.join(self.dir, "vectors.bin")
+        self.keys_path = os.path.join(self.dir, "keys.txt")
+        meta_path = os.path.join(self.dir, "meta.json")
+
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["dim"] != dim:
+                raise ValueError(f"Embedding cache {self.dir} holds dim {meta['dim']}, model gives {dim}.")
+            dtype = meta["dtype"]
+        else:
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump({"model": model_name, "dim": dim, "dtype": dtype}, f)
+
+        self.model_name = model_name
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.row_bytes = self.dim * self.dtype.itemsize
+
+        self.rows: Dict[str, int] = {}
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, "r", encoding="utf-8") as f:
+                for i, line in enumerate(f):
+                    self.rows[line.strip()] = i
+        # Drop vector rows written by an interrupted run that never got a key
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(len(self.rows) * self.row_bytes)
+        self._matrix = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _mapped(self):
+        if self._matrix is None or self._matrix.shape[0] != len(self.rows):
+            self._matrix = (np.memmap(self.vectors_path, dtype=self.dtype, mode="r",
+                                      shape=(len(self.rows), self.dim))
+                            if self.rows else np.empty((0, self.dim), self.dtype))
+        return self._matrix
+
+    def get_many(self, keys: List[str]) -> Dict[int, np.ndarray]:
+        """
+        Map position in `keys` -> cached float32 vector, for cache hits only.
+        """
+        hits = {i: self.rows[k] for i, k in enumerate(keys) if k in self.rows}
+        if not hits:
+            return {}
+        matrix = self._mapped()
+        positions = list(hits)
+        vecs = np.asarray(matrix[[hits[i] for i in positions]], dtype=np.float32)
+        return dict(zip(positions, vecs))
+
+    def put_many(self, keys: List[str], vectors: np.ndarray) -> None:
+        """
+        Append vectors for keys not cached yet. Vectors are written before
+        their keys, so a crash can never leave a key pointing at nothing.
+        """
+        new, pending = [], set()
+        for k, v in zip(keys, vectors):
+            if k not in self.rows and k not in pending:
+                pending.add(k)
+                new.append((k, v))
+        if not new:
+            return
+        block = np.asarray([v for _, v in new], dtype=self.dtype)
+        with open(self.vectors_path, "ab") as f:
+            f.write(block.tobytes())
+        with open(self.keys_path, "a", encoding="utf-8") as f:
+            for k, _ in new:
+                self.rows[k] = len(self.rows)
+                f.write(k + "\n")
+
+
+def save_article_embeddings(path: str, model_name: str, urls: Sequence[str], vectors: np.ndarray,
+                            categories: Sequence[str] = (), centroids: Optional[np.ndarray] = None) -> None:
+    """
+    Write article embeddings by URL, plus optional category centroids from
+    the same model, atomically to `path`.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    dim = vectors.shape[1]
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez(
+            f,
+            model=np.array(model_name),
+            urls=np.array(list(urls), dtype=str),
+            vectors=np.asarray(vectors, dtype=np.float16).reshape(-1, dim),
+            categories=np.array(list(categories), dtype=str),
+            centroids=(np.asarray(centroids, dtype=np.float32) if centroids is not None
+                       else np.empty((0, dim), dtype=np.float32)),
+        )
+    os.replace(tmp, path)
+
+
+def load_article_embeddings(path: str = ARTICLE_EMBEDDINGS) -> Optional[Dict[str, np.ndarray]]:
+    """
+    The arrays written by save_article_embeddings(), or None if there are none.
+    """
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
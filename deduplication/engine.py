@@ -1,11 +1,35 @@
 # pipeline/deduplication/engine.py
 
 import os
-import json
+import argparse
+from datetime import datetime, timezone
 import numpy as np
 import faiss
-from sentence_transformers import SentenceTransformer
-from deduplication.data_loader import load_texts_from_json
+
+try:
+    from deduplication.data_loader import article_text
+except ImportError:
+    # Fallback if run as a script: add project root to sys.path then retry
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from deduplication.data_loader import article_text
+from contracts.records import RecordWriter, iter_batches, is_record_file, RECORD_SUFFIX
+from contracts.checks import validate_records
+from storage.repository import ArticleRepository
+from storage.stage_cache import NothingNew, StageCache, code_files, fingerprint
+from deduplication.prefilter import SeenStore, prefilter
+from deduplication.embedding_cache import (
+    ARTICLE_EMBEDDINGS, EmbeddingCache, cached_dim, load_article_embeddings, save_article_embeddings,
+    text_key,
+)
+from deduplication.index_backends import (
+    IVF_MIN_TRAIN, REPORT_SAMPLE, build_index, backend_of, compact, configure,
+    configured_backend, is_id_mapped, maybe_retrain, migrate, recall_report,
+    save_index_atomic, search_params,
+)
+from deduplication.index_meta import VectorMetaStore, retention_cutoff
+from deduplication.minhash import LSHIndex
+from deduplication.categories import build_centroids
 
 # ─── CONFIGURATION ─────────────────────────────────────────────────────────
 # Use this relative path because you’ll run from pipeline/:
@@ -17,107 +41,351 @@ RAW_FOLDER    = "data_ingestion/data"
 INDEX_PATH    = "dedup.index"
 EMBED_MODEL   = "all-MiniLM-L6-v2"
 SIM_THRESHOLD = 0.85
+BATCH_SIZE    = 1000   # articles embedded and written per batch
+SELF_SIM_BLOCK = 512   # rows per block in the within-batch similarity pass
+DEDUP_OUT     = f"deduplication/unique_articles{RECORD_SUFFIX}"
+INDEX_BACKEND = configured_backend()   # DEDUP_INDEX_BACKEND: flat | hnsw | ivf
+INDEX_REPORT  = os.getenv("DEDUP_INDEX_REPORT") == "1"   # recall/latency vs. flat after the run
+RETENTION_WEEKS  = int(os.getenv("DEDUP_RETENTION_WEEKS", "8"))   # dedup window; 0 keeps everything
+COMPACT_FRACTION = 0.1       # rebuild once this share of the index is outside the window
+LEGACY_ID_BASE   = 1 << 40   # ids for vectors from before the index was ID-mapped
+VOLATILE_FIELDS  = ("published_date",)   # GitHub Trending and undated RSS items get the fetch time
 # ────────────────────────────────────────────────────────────────────────────
 
-# 1) Load the SBERT model
-print(f"[INIT] Loading embedding model: {EMBED_MODEL}")
-model = SentenceTransformer(EMBED_MODEL)
-dim = model.get_sentence_embedding_dimension()
-print(f"[INIT] Embedding dimension: {dim}")
+# 1) SBERT model and embedding cache, created on first use
+_model = None
+_embedding_cache = None
+
+def get_model():
+    global _model
+    if _model is None:
+        from sentence_transformers import SentenceTransformer
+        print(f"[INIT] Loading embedding model: {EMBED_MODEL}")
+        _model = SentenceTransformer(EMBED_MODEL)
+        print(f"[INIT] Embedding dimension: {_model.get_sentence_embedding_dimension()}")
+    return _model
+
+def embedding_dim() -> int:
+    """
+    Embedding size, taken from the embedding cache's metadata while the model
+    isn't loaded, so runs with nothing new to encode never load it.
+    """
+    if _model is None:
+        dim = cached_dim(EMBED_MODEL)
+        if dim is not None:
+            return dim
+    return get_model().get_sentence_embedding_dimension()
 
-# 2) Create or load the FAISS index
-def load_or_create_index(path: str, dim: int):
+def get_embedding_cache() -> EmbeddingCache:
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(EMBED_MODEL, embedding_dim())
+        print(f"[INIT] Embedding cache holds {len(_embedding_cache)} vectors.")
+    return _embedding_cache
+
+# 2) Create or load the FAISS index, migrating it in place if the backend changed
+_index = None
+
+def load_or_create_index(path: str, meta: VectorMetaStore):
     if os.path.exists(path):
-        idx = faiss.read_index(path)
-        print(f"[FAISS] Loaded existing index with {idx.ntotal} vectors.")
+        idx = configure(faiss.read_index(path))
+        print(f"[FAISS] Loaded existing {backend_of(idx)} index with {idx.ntotal} vectors.")
+        if not is_id_mapped(idx):
+            # Vectors from before ID mapping have no article; date them by the
+            # index file so the retention window retires them in due course
+            ids = LEGACY_ID_BASE + np.arange(idx.ntotal, dtype=np.int64)
+            added_at = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc).isoformat()
+            idx = migrate(idx, INDEX_BACKEND, ids)
+            save_index_atomic(idx, path)
+            meta.add(((i, None, "legacy") for i in ids), added_at)
+        elif backend_of(idx) != INDEX_BACKEND and not (INDEX_BACKEND == "ivf" and idx.ntotal < IVF_MIN_TRAIN):
+            idx = migrate(idx, INDEX_BACKEND)
+            save_index_atomic(idx, path)
     else:
-        idx = faiss.IndexFlatIP(dim)
-        print("[FAISS] Created new index (IndexFlatIP).")
+        idx = build_index(INDEX_BACKEND, embedding_dim())
+        print(f"[FAISS] Created new {backend_of(idx)} index.")
     return idx
 
-index = load_or_create_index(INDEX_PATH, dim)
+def get_index():
+    global _index
+    if _index is None:
+        meta = VectorMetaStore()
+        _index = load_or_create_index(INDEX_PATH, meta)
+        meta.close()
+    return _index
+
+# Ids still in the index but outside the retention window; skipped by searches
+excluded_ids = []
+
+def apply_retention(weeks: int, meta: VectorMetaStore) -> list:
+    """
+    Retire vectors added more than `weeks` ago. They are excluded from search
+    right away and physically dropped once they make up COMPACT_FRACTION of
+    the index. Returns the ids compacted away, whose metadata should be
+    removed once the index is saved.
+    """
+    global _index, excluded_ids
+    expired = meta.expired_ids(retention_cutoff(weeks))
+    if not expired:
+        return []
+    index = get_index()
+    if len(expired) >= COMPACT_FRACTION * max(1, index.ntotal):
+        _index = compact(index, expired, INDEX_BACKEND)
+        print(f"[FAISS] Compacted {len(expired)} expired vectors; index size now {_index.ntotal}.")
+        return expired
+    excluded_ids = expired
+    print(f"[FAISS] Excluding {len(expired)} expired vectors from search until the next compaction.")
+    return []
 
 # 3) Helper to save the index
 def save_index(idx, path: str):
-    faiss.write_index(idx, path)
+    save_index_atomic(idx, path)
     print(f"[FAISS] Saved index with {idx.ntotal} vectors to '{path}'.")
 
-# 4) Convert texts to normalized embeddings
+# 4) Convert texts to normalized embeddings, running the model on cache misses only
 def encode_texts(texts: list, batch_size: int = 64) -> np.ndarray:
-    all_embs = []
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i : i + batch_size]
-        embs = model.encode(batch, convert_to_numpy=True, show_progress_bar=False)
+    embedding_cache = get_embedding_cache()
+    keys = [text_key(t, EMBED_MODEL) for t in texts]
+    out = np.empty((len(texts), embedding_cache.dim), dtype=np.float32)
+    cached = embedding_cache.get_many(keys)
+    for i, vec in cached.items():
+        out[i] = vec
+
+    # Encode each distinct missing text once
+    first_pos = {}
+    for i, k in enumerate(keys):
+        if i not in cached and k not in first_pos:
+            first_pos[k] = i
+    misses = list(first_pos.values())
+    model = get_model() if misses else None
+    for i in range(0, len(misses), batch_size):
+        batch = misses[i : i + batch_size]
+        embs = model.encode([texts[j] for j in batch], convert_to_numpy=True, show_progress_bar=False)
         faiss.normalize_L2(embs)  # in-place normalization for cosine similarity
-        all_embs.append(embs)
-    return np.vstack(all_embs)
+        out[batch] = embs
+        embedding_cache.put_many([keys[j] for j in batch], embs)
+    for i, k in enumerate(keys):
+        if i not in cached and first_pos[k] != i:
+            out[i] = out[first_pos[k]]
+
+    if cached:
+        faiss.normalize_L2(out)  # cached rows are stored as float16
+    print(f"[EMBED] {len(cached)} cached, {len(misses)} encoded.")
+    return out
 
-# 5) Check duplicates vs. existing index
-def filter_duplicates(texts: list, threshold: float):
+# 5) Group near-duplicates within one batch, keeping the first of each group
+def batch_representatives(embs: np.ndarray, threshold: float, block: int = SELF_SIM_BLOCK) -> list:
+    """
+    Indices of rows that are not near-duplicates of an earlier kept row.
+    Similarities are computed one block x block tile at a time, so memory
+    stays bounded by `block` rather than growing with len(embs)**2.
+    """
+    kept = []
+    for start in range(0, len(embs), block):
+        rows = embs[start : start + block]
+        # Rows already covered by a representative from an earlier block
+        dup = np.zeros(len(rows), dtype=bool)
+        for k in range(0, len(kept), block):
+            reps = embs[kept[k : k + block]]
+            dup |= (rows @ reps.T >= threshold).any(axis=1)
+        # Within the block, a row joins the group of the first kept row it matches
+        sims = rows @ rows.T
+        block_kept = []
+        for i in np.flatnonzero(~dup):
+            if not block_kept or sims[i, block_kept].max() < threshold:
+                block_kept.append(i)
+        kept.extend(start + i for i in block_kept)
+    return kept
+
+# 6) Check duplicates vs. existing index and within the batch
+report_queries, report_query_ids = [], []
+
+def filter_duplicates(texts: list, threshold: float, ids: list):
+    """
+    Positions of the unique and duplicate texts, and the embeddings of the
+    unique ones (in the same order).
+    """
+    global _index
+    if not texts:
+        return [], [], np.empty((0, get_index().d), dtype=np.float32)
+    index = get_index()
     embs = encode_texts(texts)
+    if INDEX_REPORT and len(report_queries) < REPORT_SAMPLE:
+        report_query_ids.extend(ids[: REPORT_SAMPLE - len(report_queries)])
+        report_queries.extend(embs[: REPORT_SAMPLE - len(report_queries)])
     unique_idxs = []
     duplicate_idxs = []
 
     if index.ntotal == 0:
-        # First run: everything is unique
+        # Empty index: nothing stored to compare against yet
         unique_idxs = list(range(len(texts)))
     else:
         # Search nearest neighbor (k=1) for each new embedding
-        sims, _ = index.search(embs, k=1)
+        params = search_params(index, excluded_ids) if excluded_ids else None
+        sims, _ = index.search(embs, k=1, params=params)
         for i, sim_val in enumerate(sims.flatten()):
             if sim_val < threshold:
                 unique_idxs.append(i)
             else:
                 duplicate_idxs.append(i)
 
+    # Near-identical stories in the same batch are not in the index yet
+    reps = batch_representatives(embs[unique_idxs], threshold)
+    if len(reps) < len(unique_idxs):
+        kept = set(reps)
+        print(f"[DEDUP] {len(unique_idxs) - len(reps)} near-duplicates found within the batch.")
+        duplicate_idxs += [u for j, u in enumerate(unique_idxs) if j not in kept]
+        unique_idxs = [unique_idxs[j] for j in reps]
+
     # Add only the unique embeddings to the index
     if unique_idxs:
-        index.add(embs[unique_idxs])
+        index.add_with_ids(embs[unique_idxs], np.asarray(ids, dtype=np.int64)[unique_idxs])
         print(f"[FAISS] Added {len(unique_idxs)} new embeddings; index size now {index.ntotal}.")
+        _index = maybe_retrain(index, INDEX_BACKEND)
 
-    return unique_idxs, duplicate_idxs
+    return unique_idxs, duplicate_idxs, embs[unique_idxs]
 
-# 6) Main routine: load → dedupe → save index → write uniques
-if __name__ == "__main__":
-    # A) Load raw texts from JSON
-    texts = load_texts_from_json(RAW_FOLDER)
-    print(f"[LOAD] Loaded {len(texts)} texts from '{RAW_FOLDER}'.")
+def save_embeddings(urls: list, vectors: np.ndarray):
+    """
+    Kept articles' embeddings and freshly built section centroids, so
+    rendering needn't load the model.
+    """
+    categories, centroids = build_centroids(encode_texts)
+    save_article_embeddings(ARTICLE_EMBEDDINGS, EMBED_MODEL, urls, vectors, categories, centroids)
+
+# 7) Main routine: import new files → dedupe pending articles → save index
+def stage_fingerprint(articles: list = None) -> str:
+    inputs = ([] if articles is not None else
+              [os.path.join(RAW_FOLDER, f) for f in sorted(os.listdir(RAW_FOLDER)) if is_record_file(f)])
+    return fingerprint(
+        inputs=inputs,
+        records=articles,
+        config={"SIM_THRESHOLD": SIM_THRESHOLD, "EMBED_MODEL": EMBED_MODEL, "INDEX_BACKEND": INDEX_BACKEND,
+                "RETENTION_WEEKS": RETENTION_WEEKS, "DEDUP_OUT": DEDUP_OUT},
+        code=code_files(__file__),
+        volatile=VOLATILE_FIELDS,
+    )
+
+def run(articles: list = None, force: bool = False) -> list:
+    """
+    Dedupe every pending article and return the unique ones. With
+    `articles` (e.g. handed over in memory by the orchestrator), those are
+    stored directly instead of re-reading the raw record files.
+
+    Raises NothingNew when no article is pending, or when the inputs,
+    config and code are unchanged since the last successful run (unless
+    `force`): those uniques were handed on already, and handing them on
+    again would re-publish them. The last output is left as it was.
+    """
+    cache = StageCache()
+    fp = stage_fingerprint(articles)
+    if not force and cache.is_fresh("dedup", fp):
+        raise NothingNew(f"Inputs unchanged since the last run; '{DEDUP_OUT}' was already handed on.")
+
+    repo = ArticleRepository()
+    seen = SeenStore()
+    lsh = LSHIndex()
+    vector_meta = VectorMetaStore()
+    compacted_ids = apply_retention(RETENTION_WEEKS, vector_meta)
+    # Compacted vectors leave the LSH table only after the run; skip them now
+    retired_ids = excluded_ids + compacted_ids
+    forgotten = seen.expire(retention_cutoff(RETENTION_WEEKS))
+    if forgotten:
+        print(f"[PREFILTER] Forgot {forgotten} URL/content keys outside the retention window.")
+
+    # A) Only files that are new or changed since the last run are read
+    if articles is None:
+        added = repo.import_folder(RAW_FOLDER)
+        print(f"[LOAD] Imported {added} new articles from '{RAW_FOLDER}'; "
+              f"{repo.count('pending')} awaiting dedup.")
+    else:
+        added = repo.upsert(articles)
+        print(f"[LOAD] Stored {added} new of {len(articles)} ingested articles; "
+              f"{repo.count('pending')} awaiting dedup.")
+
+    # Nothing new: persist the retention pass and the section centroids, and
+    # leave the last output as it was
+    if repo.count("pending") == 0:
+        if compacted_ids:
+            save_index(get_index(), INDEX_PATH)
+            vector_meta.remove(compacted_ids)
+            lsh.remove(compacted_ids)
+        stored = load_article_embeddings(ARTICLE_EMBEDDINGS)
+        if stored is not None:
+            save_embeddings(stored["urls"].tolist(), stored["vectors"])
+        for store in (repo, seen, lsh, vector_meta):
+            store.close()
+        raise NothingNew(f"No new articles to dedupe; '{DEDUP_OUT}' is unchanged.")
+
+    # B) Dedupe only articles no earlier run has seen
+    unique_ids, duplicate_ids, seen_keys, indexed, signatures = [], [], [], [], []
+    unique_articles, kept_urls, kept_embs = [], [], []
+    exact = lexical = 0
+    os.makedirs(os.path.dirname(DEDUP_OUT), exist_ok=True)
+    with RecordWriter(DEDUP_OUT) as writer:
+        # Each batch is checked against the index, which already holds the
+        # uniques of earlier batches, so memory is bounded by BATCH_SIZE
+        for batch in iter_batches(repo.iter_articles(dedup_status="pending"), BATCH_SIZE):
+            # Exact URL/content repeats never reach the embedding model
+            survivors, exact_idxs, batch_keys = prefilter(batch, seen)
+            texts = [article_text(batch[i]) for i in survivors]
+            # Near-copies (syndicated stories with small edits) are caught by MinHash/LSH
+            lexical_local, sigs = lsh.find_duplicates(texts, exclude=retired_ids)
+            lexical_set = set(lexical_local)
+            ambiguous = [j for j in range(len(survivors)) if j not in lexical_set]
+            unique_local, duplicate_local, unique_embs = filter_duplicates(
+                [texts[j] for j in ambiguous], SIM_THRESHOLD, [batch[survivors[j]]["id"] for j in ambiguous])
+            unique_idxs = [survivors[ambiguous[i]] for i in unique_local]
+            kept_urls += [batch[i].get("url", "") for i in unique_idxs]
+            kept_embs.append(unique_embs)
+            duplicate_idxs = (exact_idxs + [survivors[j] for j in lexical_local]
+                              + [survivors[ambiguous[i]] for i in duplicate_local])
+            signatures += [(batch[survivors[ambiguous[i]]]["id"], sigs[ambiguous[i]]) for i in unique_local]
 
-    # B) Filter out duplicates
-    unique_idxs, duplicate_idxs = filter_duplicates(texts, SIM_THRESHOLD)
-    print(f"[RESULT] {len(unique_idxs)} unique, {len(duplicate_idxs)} duplicates filtered.")
+            batch_unique = [batch[i] for i in sorted(unique_idxs)]
+            writer.write_many(batch_unique)
+            unique_articles += batch_unique
+            unique_ids += [batch[i]["id"] for i in unique_idxs]
+            indexed += [(batch[i]["id"], batch[i].get("published_date"), batch[i].get("source_platform"))
+                        for i in unique_idxs]
+            duplicate_ids += [batch[i]["id"] for i in duplicate_idxs]
+            seen_keys += batch_keys
+            exact += len(exact_idxs)
+            lexical += len(lexical_local)
+    print(f"[RESULT] {len(unique_ids)} unique, {len(duplicate_ids)} duplicates filtered "
+          f"({exact} exact repeats and {lexical} near-copies skipped before embedding).")
 
-    # C) Persist the FAISS index
+    # C) Persist the FAISS index, then record the outcome per article
+    index = get_index()
     save_index(index, INDEX_PATH)
+    save_embeddings(kept_urls, np.vstack(kept_embs) if kept_embs else np.empty((0, index.d), dtype=np.float32))
+    vector_meta.add(indexed)
+    vector_meta.remove(compacted_ids)
+    vector_meta.close()
+    lsh.add(signatures)
+    lsh.remove(compacted_ids)
+    lsh.close()
+    if INDEX_REPORT and report_queries and index.ntotal:
+        report = recall_report(index, np.vstack(report_queries), k=10, query_ids=np.asarray(report_query_ids))
+        print(f"[FAISS] Recall report: {report}")
+    repo.set_dedup_status(unique_ids, "unique")
+    repo.set_dedup_status(duplicate_ids, "duplicate")
+    seen.add(seen_keys)
+    seen.close()
+    repo.close()
+    print(f"[SAVE] {writer.count} unique articles written to '{DEDUP_OUT}'.")
 
-    # D) Write unique articles (full JSON objects) to a new file
-    def load_articles(folder_path: str):
-        articles_list = []
-        for fname in os.listdir(folder_path):
-            if not fname.endswith(".json"):
-                continue
-            path = os.path.join(folder_path, fname)
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                for art in data:
-                    articles_list.append(art)
-        return articles_list
-
-    all_articles = load_articles(RAW_FOLDER)
-    unique_articles = [all_articles[i] for i in unique_idxs]
-
-    OUT_UNIQUE = "deduplication/unique_articles.json"
-    os.makedirs(os.path.dirname(OUT_UNIQUE), exist_ok=True)
-    with open(OUT_UNIQUE, "w", encoding="utf-8") as outf:
-        json.dump(unique_articles, outf, ensure_ascii=False, indent=2)
-    print(f"[SAVE] {len(unique_articles)} unique articles written to '{OUT_UNIQUE}'.")
-
-
-# After dedup writes deduplication/unique_articles.json:
-from contracts.checks import load_json_array, ensure_article_fields, ensure_min_count
-
-DEDUP_OUT = "deduplication/unique_articles.json"
-items = load_json_array(DEDUP_OUT)
-ensure_article_fields(items, ["title","url","published_date","source_platform","content"])
-ensure_min_count(items, 5, DEDUP_OUT)  # adjust threshold
-print("[CONTRACT] Deduplication output OK.")
\ No newline at end of file
+    # Validate the dedup contract in one streaming pass
+    validate_records(DEDUP_OUT, ["title","url","published_date","source_platform","content"], 5)  # adjust threshold
+    print("[CONTRACT] Deduplication output OK.")
+    cache.record("dedup", fp, [DEDUP_OUT, ARTICLE_EMBEDDINGS])
+    return unique_articles
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deduplicate ingested articles.")
+    parser.add_argument("--force", action="store_true", help="rerun even if inputs are unchanged")
+    try:
+        run(force=parser.parse_args().force)
+    except NothingNew as e:
+        print(f"[SKIP] {e}")
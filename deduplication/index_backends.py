@@ -0,0 +1,256 @@
+# pipeline/deduplication/index_backends.py
+# FAISS index backends for the dedup store: exact flat search, or HNSW / IVF
+# approximate search whose cost stays roughly flat as the archive grows.
+# Every index is wrapped in an IndexIDMap2 keyed by article id.
+#
+#   python -m deduplication.index_backends migrate [flat|hnsw|ivf]
+#   python -m deduplication.index_backends report
+
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import faiss
+
+# ─── CONFIGURATION ─────────────────────────────────────────────────────────
+BACKENDS             = ("flat", "hnsw", "ivf")
+HNSW_M               = 32      # graph degree; higher = better recall, more memory
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH       = 64
+IVF_MIN_TRAIN        = 10_000  # an "ivf" store stays flat until it has this many vectors
+IVF_NPROBE           = 16      # lists scanned per query
+IVF_RETRAIN_GROWTH   = 4       # retrain once ntotal is this multiple of the training size
+REPORT_PATH          = "deduplication/index_report.json"
+REPORT_SAMPLE        = 256     # queries used for a recall/latency report
+# ────────────────────────────────────────────────────────────────────────────
+
+
+def configured_backend() -> str:
+    backend = os.getenv("DEDUP_INDEX_BACKEND", "flat").lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"DEDUP_INDEX_BACKEND must be one of {BACKENDS}, got '{backend}'.")
+    return backend
+
+
+def is_id_mapped(idx) -> bool:
+    return isinstance(idx, faiss.IndexIDMap)
+
+
+def base_of(idx):
+    """
+    The index doing the actual search, below any ID map.
+    """
+    return faiss.downcast_index(idx.index) if is_id_mapped(idx) else idx
+
+
+def backend_of(idx) -> str:
+    base = base_of(idx)
+    if isinstance(base, faiss.IndexHNSWFlat):
+        return "hnsw"
+    if isinstance(base, faiss.IndexIVF):
+        return "ivf"
+    return "flat"
+
+
+def configure(idx):
+    """
+    Apply search-time parameters, which are not stored in the index file.
+    """
+    base = base_of(idx)
+    if isinstance(base, faiss.IndexHNSWFlat):
+        base.hnsw.efSearch = HNSW_EF_SEARCH
+    elif isinstance(base, faiss.IndexIVF):
+        base.nprobe = IVF_NPROBE
+    return idx
+
+
+def search_params(idx, exclude_ids: Iterable[int]):
+    """
+    Search parameters that skip `exclude_ids`, typed for the index's backend.
+    """
+    excluded = faiss.IDSelectorBatch(np.asarray(list(exclude_ids), dtype=np.int64))
+    sel = faiss.IDSelectorNot(excluded)
+    backend = backend_of(idx)
+    if backend == "hnsw":
+        params = faiss.SearchParametersHNSW(sel=sel, efSearch=HNSW_EF_SEARCH)
+    elif backend == "ivf":
+        params = faiss.SearchParametersIVF(sel=sel, nprobe=IVF_NPROBE)
+    else:
+        params = faiss.SearchParameters(sel=sel)
+    params.selectors = (excluded, sel)   # keep the SWIG objects alive with params
+    return params
+
+
+def all_vectors(idx) -> np.ndarray:
+    """
+    Every stored vector, in insertion order.
+    """
+    base = base_of(idx)
+    if base.ntotal == 0:
+        return np.empty((0, base.d), dtype=np.float32)
+    if isinstance(base, faiss.IndexIVF):
+        base.make_direct_map()
+    return base.reconstruct_n(0, base.ntotal)
+
+
+def all_ids(idx) -> np.ndarray:
+    """
+    The id of every stored vector, aligned with all_vectors().
+    """
+    if is_id_mapped(idx):
+        return faiss.vector_to_array(idx.id_map).astype(np.int64)
+    return np.arange(idx.ntotal, dtype=np.int64)
+
+
+def _ivf_nlist(n: int) -> int:
+    return max(1, int(np.sqrt(n)))
+
+
+def _ivf_trained_for(idx) -> int:
+    # Inverse of _ivf_nlist: the store size the current lists were trained on
+    return idx.nlist ** 2
+
+
+def build_index(backend: str, dim: int, vectors: Optional[np.ndarray] = None,
+                ids: Optional[np.ndarray] = None):
+    """
+    A new ID-mapped index of `backend` holding `vectors` (L2-normalized,
+    float32) under `ids`. An IVF index needs training data, so it starts
+    as a flat index until there are IVF_MIN_TRAIN vectors to train on.
+    """
+    vectors = np.empty((0, dim), dtype=np.float32) if vectors is None else vectors
+    if backend == "hnsw":
+        base = faiss.IndexHNSWFlat(dim, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        base.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    elif backend == "ivf" and len(vectors) >= IVF_MIN_TRAIN:
+        nlist = _ivf_nlist(len(vectors))
+        quantizer = faiss.IndexFlatIP(dim)
+        base = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        base.train(vectors)
+    else:
+        base = faiss.IndexFlatIP(dim)
+    idx = faiss.IndexIDMap2(base)
+    if len(vectors):
+        idx.add_with_ids(vectors, np.asarray(ids, dtype=np.int64))
+    return configure(idx)
+
+
+def migrate(idx, backend: str, ids: Optional[np.ndarray] = None):
+    """
+    Rebuild `idx` as an ID-mapped `backend` index if it isn't one already.
+    Vectors keep their ids; `ids` must be given for an index without an ID map.
+    """
+    if is_id_mapped(idx) and backend_of(idx) == backend:
+        return configure(idx)
+    if ids is None:
+        ids = all_ids(idx)
+    new_idx = build_index(backend, idx.d, all_vectors(idx), ids)
+    print(f"[FAISS] Migrated index {backend_of(idx)} → ID-mapped {backend_of(new_idx)} ({new_idx.ntotal} vectors).")
+    return new_idx
+
+
+def compact(idx, drop_ids: Iterable[int], backend: str):
+    """
+    Rebuild `idx` as `backend` without the vectors in `drop_ids`. An IVF
+    index is retrained on what remains, so its lists match the smaller store.
+    """
+    ids = all_ids(idx)
+    keep = ~np.isin(ids, np.asarray(list(drop_ids), dtype=np.int64))
+    return build_index(backend, idx.d, all_vectors(idx)[keep], ids[keep])
+
+
+def maybe_retrain(idx, backend: str):
+    """
+    For the IVF backend: train once enough vectors exist, and retrain when
+    the store has outgrown the lists it was trained with.
+    """
+    if backend != "ivf":
+        return idx
+    if backend_of(idx) == "flat":
+        if idx.ntotal < IVF_MIN_TRAIN:
+            return idx
+    elif idx.ntotal < IVF_RETRAIN_GROWTH * _ivf_trained_for(base_of(idx)):
+        return idx
+    print(f"[FAISS] (Re)training IVF index on {idx.ntotal} vectors.")
+    return build_index("ivf", idx.d, all_vectors(idx), all_ids(idx))
+
+
+def save_index_atomic(idx, path: str) -> None:
+    tmp = f"{path}.tmp"
+    faiss.write_index(idx, tmp)
+    os.replace(tmp, path)
+
+
+def _neighbours(ids: np.ndarray, own_ids: Optional[np.ndarray], k: int) -> list:
+    rows = ids.tolist()
+    own = own_ids.tolist() if own_ids is not None else [None] * len(rows)
+    return [[i for i in row if i != self_id and i != -1][:k] for row, self_id in zip(rows, own)]
+
+
+def recall_report(idx, queries: np.ndarray, k: int = 1, path: Optional[str] = REPORT_PATH,
+                  query_ids: Optional[np.ndarray] = None) -> Dict:
+    """
+    Compare `idx` against an exact flat search over the same vectors:
+    recall@k and per-query latency of both. Written to `path` as JSON.
+
+    Queries that are themselves stored must come with their `query_ids`:
+    each query's own id is then left out of both result lists, since any
+    index finds a stored vector at rank 1 and that would inflate recall.
+    """
+    queries = np.ascontiguousarray(queries[:REPORT_SAMPLE], dtype=np.float32)
+    if query_ids is not None:
+        query_ids = np.asarray(query_ids, dtype=np.int64)[: len(queries)]
+    fetch = k + (query_ids is not None)
+    exact = build_index("flat", idx.d, all_vectors(idx), all_ids(idx))
+
+    start = time.perf_counter()
+    _, ann_ids = idx.search(queries, fetch)
+    ann_ms = (time.perf_counter() - start) * 1000 / max(1, len(queries))
+    start = time.perf_counter()
+    _, flat_ids = exact.search(queries, fetch)
+    flat_ms = (time.perf_counter() - start) * 1000 / max(1, len(queries))
+
+    ann, flat = _neighbours(ann_ids, query_ids, k), _neighbours(flat_ids, query_ids, k)
+    hits = sum(len(set(a) & set(f)) for a, f in zip(ann, flat))
+    report = {
+        "backend": backend_of(idx),
+        "ntotal": idx.ntotal,
+        "queries": len(queries),
+        "k": k,
+        f"recall@{k}": round(hits / max(1, sum(len(f) for f in flat)), 4),
+        "ann_ms_per_query": round(ann_ms, 4),
+        "flat_ms_per_query": round(flat_ms, 4),
+    }
+    if path:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    index_path = os.getenv("DEDUP_INDEX_PATH", "dedup.index")
+    command = sys.argv[1] if len(sys.argv) > 1 else "report"
+    idx = configure(faiss.read_index(index_path))
+
+    if command == "migrate":
+        target = sys.argv[2] if len(sys.argv) > 2 else configured_backend()
+        if not is_id_mapped(idx):
+            sys.exit("Run the dedup engine once to assign ids to a legacy index.")
+        idx = migrate(idx, target)
+        save_index_atomic(idx, index_path)
+        print(f"[FAISS] '{index_path}' is now {backend_of(idx)} with {idx.ntotal} vectors.")
+    elif command == "report":
+        # Perturbed copies of stored vectors stand in for near-duplicate
+        # queries; each one's source is left out of the results
+        rng = np.random.default_rng(0)
+        vectors = all_vectors(idx)
+        rows = rng.choice(len(vectors), min(REPORT_SAMPLE, len(vectors)), replace=False)
+        queries = (vectors[rows] + rng.normal(0, 0.02, (len(rows), idx.d))).astype(np.float32)
+        faiss.normalize_L2(queries)
+        print(json.dumps(recall_report(idx, queries, k=10, query_ids=all_ids(idx)[rows]), indent=2))
+    else:
+        sys.exit(f"Unknown command '{command}'; use 'migrate' or 'report'.")
@@ -0,0 +1,63 @@
+# pipeline/deduplication/index_meta.py
+# Sidecar metadata for the ID-mapped dedup index: when each vector was
+# added and where its article came from, so old vectors can be retired.
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from storage.repository import DB_PATH
+from storage.sqlite_util import connect, in_chunks
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dedup_vectors (
+    id              INTEGER PRIMARY KEY,   -- FAISS id; the article id for new vectors
+    added_at        TEXT NOT NULL,
+    published_date  TEXT,
+    source_platform TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_dedup_vectors_added ON dedup_vectors(added_at);
+"""
+
+
+def retention_cutoff(weeks: int) -> Optional[str]:
+    """
+    ISO timestamp before which vectors fall out of the window; None keeps all.
+    """
+    if weeks <= 0:
+        return None
+    return (datetime.now(timezone.utc) - timedelta(weeks=weeks)).isoformat()
+
+
+class VectorMetaStore:
+    def __init__(self, path: str = DB_PATH):
+        self.conn = connect(path, SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def add(self, rows: Iterable[Tuple[int, Optional[str], Optional[str]]],
+            added_at: Optional[str] = None) -> None:
+        """
+        Record (id, published_date, source_platform) for newly indexed vectors.
+        """
+        added_at = added_at or datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO dedup_vectors (id, added_at, published_date, source_platform)"
+                " VALUES (?, ?, ?, ?)",
+                [(int(i), added_at, published, source) for i, published, source in rows],
+            )
+
+    def expired_ids(self, cutoff: Optional[str]) -> List[int]:
+        if cutoff is None:
+            return []
+        return [row[0] for row in self.conn.execute(
+            "SELECT id FROM dedup_vectors WHERE added_at < ?", (cutoff,))]
+
+    def remove(self, ids: List[int]) -> None:
+        with self.conn:
+            for chunk, marks in in_chunks(ids):
+                self.conn.execute(f"DELETE FROM dedup_vectors WHERE id IN ({marks})", chunk)
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM dedup_vectors").fetchone()[0]
@@ -0,0 +1,163 @@
+# pipeline/deduplication/minhash.py
+# Lexical dedup tier: word-shingle MinHash signatures with a persistent LSH
+# band index. Catches syndicated copies with small edits on CPU before an
+# article ever reaches the embedding model.
+
+import hashlib
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from storage.keys import normalize_text
+from storage.repository import DB_PATH
+from storage.sqlite_util import connect, in_chunks
+
+# ─── CONFIGURATION ─────────────────────────────────────────────────────────
+SHINGLE_SIZE      = 3      # words per shingle
+NUM_PERM          = 128    # MinHash permutations
+BANDS             = 16     # LSH bands of NUM_PERM // BANDS rows; candidate at Jaccard ≳ 0.7
+JACCARD_THRESHOLD = 0.8    # estimated Jaccard at or above which a candidate is a copy
+MIN_SHINGLES      = 8      # shorter texts are left to the semantic tier
+# ────────────────────────────────────────────────────────────────────────────
+
+ROWS = NUM_PERM // BANDS
+_WORD = re.compile(r"\w+")
+
+# Multiply-shift hash family, fixed so signatures stay comparable across runs
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dedup_minhash (
+    id        INTEGER PRIMARY KEY,   -- article id
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dedup_lsh (
+    band   INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    id     INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dedup_lsh_bucket ON dedup_lsh(bucket, band);
+CREATE INDEX IF NOT EXISTS idx_dedup_lsh_id     ON dedup_lsh(id);
+"""
+
+
+
+def shingles(text: str) -> np.ndarray:
+    """
+    Distinct 32-bit hashes of the text's word SHINGLE_SIZE-grams, ignoring
+    case and punctuation.
+    """
+    words = _WORD.findall(normalize_text(text))
+    grams = {" ".join(words[i : i + SHINGLE_SIZE]) for i in range(max(1, len(words) - SHINGLE_SIZE + 1))}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def signature(text: str) -> Optional[np.ndarray]:
+    """
+    MinHash signature (NUM_PERM uint32 values), or None if the text is too
+    short for a reliable lexical comparison.
+    """
+    hashes = shingles(text)
+    if len(hashes) < MIN_SHINGLES:
+        return None
+    # (a*x + b) mod 2**64, top 32 bits: one row per permutation
+    with np.errstate(over="ignore"):
+        permuted = (hashes[:, None] * _A + _B) >> np.uint64(32)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def band_keys(sig: np.ndarray) -> List[int]:
+    """
+    One signed 64-bit bucket key per band, as SQLite stores integers.
+    """
+    return [int.from_bytes(hashlib.blake2b(sig[b * ROWS : (b + 1) * ROWS].tobytes(), digest_size=8).digest(),
+                           "little", signed=True)
+            for b in range(BANDS)]
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Estimated Jaccard similarity of the shingle sets behind two signatures.
+    """
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+class LSHIndex:
+    """
+    Persistent MinHash LSH index over the articles dedup has kept.
+    """
+    def __init__(self, path: str = DB_PATH):
+        self.conn = connect(path, SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _stored_candidates(self, keys: Set[Tuple[int, int]]) -> Dict[Tuple[int, int], List[int]]:
+        buckets = sorted({bucket for _, bucket in keys})
+        found: Dict[Tuple[int, int], List[int]] = {}
+        for chunk, marks in in_chunks(buckets):
+            for band, bucket, id_ in self.conn.execute(
+                    f"SELECT band, bucket, id FROM dedup_lsh WHERE bucket IN ({marks})", chunk):
+                if (band, bucket) in keys:
+                    found.setdefault((band, bucket), []).append(id_)
+        return found
+
+    def _signatures(self, ids: Iterable[int]) -> Dict[int, np.ndarray]:
+        sigs = {}
+        for chunk, marks in in_chunks(ids):
+            for id_, blob in self.conn.execute(
+                    f"SELECT id, signature FROM dedup_minhash WHERE id IN ({marks})", chunk):
+                sigs[id_] = np.frombuffer(blob, dtype=np.uint32)
+        return sigs
+
+    def find_duplicates(self, texts: List[str], exclude: Iterable[int] = ()) -> Tuple[List[int], List[Optional[np.ndarray]]]:
+        """
+        Positions in `texts` that are near-copies of an indexed article (other
+        than those in `exclude`) or of an earlier text in the same list.
+        Also returns each text's signature for a later `add`.
+        """
+        sigs = [signature(t) for t in texts]
+        keys = [band_keys(s) if s is not None else [] for s in sigs]
+        wanted = {(b, k) for ks in keys for b, k in enumerate(ks)}
+        stored = self._stored_candidates(wanted)
+        exclude = set(exclude)
+        stored_sigs = self._signatures({i for ids in stored.values() for i in ids} - exclude)
+
+        duplicates = []
+        batch_buckets: Dict[Tuple[int, int], List[int]] = {}
+        for pos, (sig, ks) in enumerate(zip(sigs, keys)):
+            if sig is None:
+                continue
+            stored_ids = {i for b, k in enumerate(ks) for i in stored.get((b, k), ())} & stored_sigs.keys()
+            earlier = {p for b, k in enumerate(ks) for p in batch_buckets.get((b, k), ())}
+            if (any(similarity(sig, stored_sigs[i]) >= JACCARD_THRESHOLD for i in stored_ids)
+                    or any(similarity(sig, sigs[p]) >= JACCARD_THRESHOLD for p in earlier)):
+                duplicates.append(pos)
+                continue
+            for b, k in enumerate(ks):
+                batch_buckets.setdefault((b, k), []).append(pos)
+        return duplicates, sigs
+
+    def add(self, items: Iterable[Tuple[int, Optional[np.ndarray]]]) -> None:
+        """
+        Index (article id, signature) pairs; pairs without a signature are skipped.
+        """
+        sig_rows, band_rows = [], []
+        for id_, sig in items:
+            if sig is None:
+                continue
+            sig_rows.append((int(id_), sig.tobytes()))
+            band_rows += [(b, k, int(id_)) for b, k in enumerate(band_keys(sig))]
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO dedup_minhash (id, signature) VALUES (?, ?)", sig_rows)
+            self.conn.executemany("INSERT INTO dedup_lsh (band, bucket, id) VALUES (?, ?, ?)", band_rows)
+
+    def remove(self, ids: List[int]) -> None:
+        with self.conn:
+            for chunk, marks in in_chunks(ids):
+                self.conn.execute(f"DELETE FROM dedup_minhash WHERE id IN ({marks})", chunk)
+                self.conn.execute(f"DELETE FROM dedup_lsh WHERE id IN ({marks})", chunk)
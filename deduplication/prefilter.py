@@ -0,0 +1,92 @@
+# pipeline/deduplication/prefilter.py
+# Cheap exact-duplicate check (canonical URL + normalized content hash)
+# that runs before any article reaches the embedding model.
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from storage.keys import canonical_url, content_hash, normalize_text
+from storage.repository import DB_PATH
+from storage.sqlite_util import connect, in_chunks
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dedup_seen (
+    key        TEXT PRIMARY KEY,   -- "url:<canonical url>" or "hash:<content sha1>"
+    first_seen TEXT NOT NULL
+);
+"""
+
+MIN_HASH_CONTENT = 40   # shorter normalized content is too generic to identify a story
+
+
+def article_keys(art: Dict) -> List[str]:
+    """
+    The article's "url:" key, if it has a URL, and its "hash:" key, if its
+    content is long enough that equal hashes mean the same story.
+    """
+    keys = []
+    if len(normalize_text(art.get("content", ""))) >= MIN_HASH_CONTENT:
+        keys.append(f"hash:{content_hash(art.get('title', ''), art.get('content', ''))}")
+    url = canonical_url(art.get("url") or "")
+    if url:
+        keys.insert(0, f"url:{url}")
+    return keys
+
+
+class SeenStore:
+    """
+    Persistent set of URL and content keys of every article dedup has handled.
+    """
+    def __init__(self, path: str = DB_PATH):
+        self.conn = connect(path, SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def contains(self, keys: Iterable[str]) -> Set[str]:
+        """
+        The subset of `keys` already recorded.
+        """
+        found = set()
+        for chunk, marks in in_chunks(keys):
+            found.update(row[0] for row in self.conn.execute(
+                f"SELECT key FROM dedup_seen WHERE key IN ({marks})", chunk))
+        return found
+
+    def add(self, keys: Iterable[str]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO dedup_seen (key, first_seen) VALUES (?, ?)",
+                                  [(k, now) for k in keys])
+
+    def expire(self, cutoff: Optional[str]) -> int:
+        """
+        Forget keys first seen before `cutoff` (None keeps all); returns how many.
+        """
+        if cutoff is None:
+            return 0
+        with self.conn:
+            return self.conn.execute("DELETE FROM dedup_seen WHERE first_seen < ?", (cutoff,)).rowcount
+
+
+def prefilter(articles: List[Dict], seen: SeenStore) -> Tuple[List[int], List[int], List[str]]:
+    """
+    Split a batch into survivors and exact duplicates.
+
+    An article is an exact duplicate if its canonical URL or content hash
+    was seen on an earlier run or earlier in this batch. Returns
+    (survivor_idxs, duplicate_idxs, batch_keys); record `batch_keys` with
+    `seen.add` once the batch's outcome has been persisted.
+    """
+    keys_per_article = [article_keys(art) for art in articles]
+    batch_keys = [k for keys in keys_per_article for k in keys]
+    already_seen = seen.contains(batch_keys)
+
+    survivors, duplicates = [], []
+    for i, keys in enumerate(keys_per_article):
+        if any(k in already_seen for k in keys):
+            duplicates.append(i)
+        else:
+            survivors.append(i)
+        already_seen.update(keys)
+    return survivors, duplicates, batch_keys
@@ -0,0 +1,31 @@
+# pipeline/orchestration/__main__.py
+# python -m orchestration [--full-refresh] [--high-volume] [--no-prewarm] [--force]
+
+import argparse
+import os
+
+from orchestration.pipeline import run_pipeline
+from storage.stage_cache import NothingNew
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the whole newsletter pipeline in one process.")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="ignore stored watermarks and fetch each source's full window")
+    parser.add_argument("--high-volume", action="store_true",
+                        help="page through the API sources up to their high-volume limits")
+    parser.add_argument("--no-prewarm", action="store_true",
+                        help="load models when their stage starts instead of during ingestion")
+    parser.add_argument("--force", action="store_true",
+                        help="rerun every stage even if its inputs are unchanged")
+    args = parser.parse_args()
+    try:
+        run_pipeline(full_refresh=args.full_refresh, high_volume=args.high_volume,
+                     prewarm=not args.no_prewarm, force=args.force)
+        new_stories = True
+    except NothingNew as e:
+        print(f"[PIPELINE] {e} Summarization and rendering skipped; no issue this run.")
+        new_stories = False
+    # Lets the workflow skip the email step
+    if os.getenv("GITHUB_OUTPUT"):
+        with open(os.environ["GITHUB_OUTPUT"], "a", encoding="utf-8") as f:
+            f.write(f"new_stories={str(new_stories).lower()}\n")
@@ -0,0 +1,100 @@
+# pipeline/orchestration/pipeline.py
+# Runs ingestion → dedup → summarization → rendering in one process. Models
+# stay loaded between stages and articles are handed over in memory; every
+# stage still writes and validates its usual artifact.
+
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+from data_ingestion import main as ingestion
+from deduplication import engine as dedup
+from summarization import engine as summarization
+from rendering import build_newsletter
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class StageTimer:
+    def __init__(self):
+        self.stats: List[Dict] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stats.append({"stage": name,
+                               "seconds": round(time.perf_counter() - start, 2),
+                               "peak_rss_mb": round(peak_rss_mb(), 1)})
+
+    def format(self) -> str:
+        return "\n".join(f"  {s['stage']:<14} {s['seconds']:>8.2f}s   peak RSS {s['peak_rss_mb']:>8.1f} MB"
+                         for s in self.stats)
+
+
+class ModelWarmer(threading.Thread):
+    """
+    Loads the SBERT and summarization models in the background, so they are
+    ready by the time ingestion's network I/O finishes. join() re-raises a
+    loader's error; the stages use the models only after it returns.
+    """
+    def __init__(self):
+        super().__init__(name="warm-models", daemon=True)
+        self.error = None
+
+    def run(self):
+        try:
+            dedup.get_model()
+            summarization.get_summarizer()
+        except BaseException as e:
+            self.error = e
+
+    def join(self, timeout=None):
+        super().join(timeout)
+        if self.error is not None:
+            raise self.error
+
+
+def warm_models() -> ModelWarmer:
+    warmer = ModelWarmer()
+    warmer.start()
+    return warmer
+
+
+def run_pipeline(full_refresh: bool = False, high_volume: bool = False, prewarm: bool = True,
+                 force: bool = False) -> List[Dict]:
+    """
+    Run every stage; summarization and rendering reuse their last outputs
+    when their inputs are unchanged, unless `force`. Raises NothingNew
+    (after ingestion and dedup) when there are no new stories to send.
+    """
+    timer = StageTimer()
+    warming = warm_models() if prewarm else None
+    try:
+        with timer.stage("ingestion"):
+            ingested = []
+            ingestion.run(full_refresh=full_refresh, high_volume=high_volume, on_article=ingested.append)
+        if warming is not None:
+            with timer.stage("model warmup"):
+                warming.join()
+        with timer.stage("dedup"):
+            unique = dedup.run(articles=ingested, force=force)
+            del ingested
+        with timer.stage("summarization"):
+            summaries = summarization.run(articles=unique, force=force)
+            del unique
+        with timer.stage("rendering"):
+            build_newsletter.main(items=summaries, force=force)
+    finally:
+        print(f"[PIPELINE] Stage timings:\n{timer.format()}")
+    return timer.stats
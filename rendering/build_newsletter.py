@@ -22,11 +22,20 @@ if PARENT_OF_PROJECT not in sys.path:
     sys.path.insert(0, PARENT_OF_PROJECT)
 
 # now import from the local package
-from pipeline.contracts.checks import load_json_array, ensure_article_fields, ContractError
+try:
+    from pipeline.contracts.checks import load_json_array, ensure_article_fields, ContractError
+    from pipeline.storage.stage_cache import StageCache, code_files, fingerprint
+    from pipeline.rendering.categorize import ARTICLE_EMBEDDINGS, categorize
+except ImportError:
+    # Checked out under another directory name, or imported from the project root
+    from contracts.checks import load_json_array, ensure_article_fields, ContractError
+    from storage.stage_cache import StageCache, code_files, fingerprint
+    from rendering.categorize import ARTICLE_EMBEDDINGS, categorize
 
 HERE = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(HERE)
 SUMMARY_FILE = os.path.join(PROJECT_ROOT, "summarization", "summaries.json")
+EMBEDDINGS_FILE = os.path.join(PROJECT_ROOT, ARTICLE_EMBEDDINGS)   # written by dedup, used for sections
 
 OUT_FULL = os.path.join(HERE, "newsletter.html")            # web preview
 OUT_FRAG = os.path.join(HERE, "newsletter_fragment.html")   # Substack paste
@@ -65,18 +74,6 @@ def other_sentences(text: str, limit=3, min_len=25) -> List[str]:
     parts = re.split(r"(?<=[.!?])\s+", text.strip())[1:]
     return [p.strip() for p in parts if len(p.strip()) >= min_len][:limit]
 
-def guess_category(title: str, source: str) -> str:
-    t = f"{(title or '').lower()} {(source or '').lower()}"
-    if "github" in t or "open source" in t:
-        return "OPEN SOURCE"
-    if any(k in t for k in ["paper", "arxiv", "benchmark", "study", "research"]):
-        return "AI RESEARCH"
-    if any(k in t for k in ["act", "law", "policy", "regulat"]):
-        return "POLICY"
-    if any(k in t for k in ["launch", "release", "ship", "beta", "announce"]):
-        return "PRODUCT"
-    return "TOOLS"
-
 EMOJI = {"PRODUCT":"🚀","AI RESEARCH":"🧬","OPEN SOURCE":"📦","POLICY":"🏛️","TOOLS":"🛠️"}
 
 def estimate_read_time(words: int, wpm: int = 220) -> int:
@@ -230,17 +227,32 @@ def chips_nav(available_sections: List[str]) -> str:
     return "".join(parts)
 
 # ───────────────────────── main ─────────────────────────
-def main(limit_total: int = 15) -> None:
-    if not os.path.exists(SUMMARY_FILE):
+def main(limit_total: int = 15, items: Optional[List[Dict]] = None, force: bool = False) -> None:
+    """Build the newsletter from `items`, or from SUMMARY_FILE if not given."""
+    if items is None and not os.path.exists(SUMMARY_FILE):
         raise FileNotFoundError(f"Not found: {SUMMARY_FILE}")
     try:
-        items = load_json_array(SUMMARY_FILE)
+        if items is None:
+            items = load_json_array(SUMMARY_FILE)
         ensure_article_fields(items, ["title","url","published_date","source_platform","summary"])
         print("[CONTRACT] Summaries OK.")
     except ContractError as e:
         print(str(e))
         raise
 
+    # skip if the same summaries were already rendered today with this code and logo
+    issue_date = datetime.now(timezone.utc).strftime("%b %d, %Y (UTC)")
+    cache = StageCache(os.path.join(PROJECT_ROOT, "storage", "stage_cache.json"))
+    fp = fingerprint(
+        inputs=([LOGO_PATH_OR_URL] if os.path.isfile(LOGO_PATH_OR_URL) else []) + [EMBEDDINGS_FILE],
+        records=items,
+        config={"limit_total": limit_total, "issue_date": issue_date, "logo": LOGO_PATH_OR_URL},
+        code=code_files(__file__),
+    )
+    if not force and cache.is_fresh("rendering", fp):
+        print(f"[CACHE] Summaries unchanged since the last build; keeping {OUT_FULL}")
+        return
+
     # dedupe + sort
     seen = set()
     cleaned: List[Dict] = []
@@ -260,8 +272,8 @@ def main(limit_total: int = 15) -> None:
 
     # group by category
     grouped: Dict[str, List[Dict]] = {"PRODUCT": [], "AI RESEARCH": [], "OPEN SOURCE": [], "POLICY": [], "TOOLS": []}
-    for a in articles:
-        cat = a.get("category") or guess_category(a.get("title", ""), a.get("source_platform", ""))
+    for a, guessed in zip(articles, categorize(articles, EMBEDDINGS_FILE)):
+        cat = a.get("category") or guessed
         grouped.setdefault(cat, [])
         grouped[cat].append(a)
 
@@ -273,7 +285,6 @@ def main(limit_total: int = 15) -> None:
     chips = chips_nav(available)
 
     bullets = build_top_bullets(articles)
-    issue_date = datetime.now(timezone.utc).strftime("%b %d, %Y (UTC)")
     logo_html = make_logo_html(LOGO_PATH_OR_URL)
 
     html_body = (BASE_HTML
@@ -295,6 +306,10 @@ def main(limit_total: int = 15) -> None:
     with open(OUT_FRAG, "w", encoding="utf-8") as out: out.write(html_body)
     print(f"[BUILD] {OUT_FULL} generated for {issue_date}")
     print(f"[BUILD] {OUT_FRAG} generated (Substack paste)")
+    cache.record("rendering", fp, [OUT_FULL, OUT_FRAG])
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Build the newsletter HTML from the summaries.")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the summaries are unchanged")
+    main(force=parser.parse_args().force)
\ No newline at end of file
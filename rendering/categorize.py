@@ -0,0 +1,61 @@
+# pipeline/rendering/categorize.py
+# Newsletter section for each story. Dedup stores every kept article's SBERT
+# embedding next to its output, together with one centroid per section built
+# from the prototypes in deduplication/categories.py; here all stories are
+# scored against all centroids in one matrix multiplication, without loading
+# the model.
+# Stories without an embedding or a confident match fall back to keyword rules.
+
+import re
+from typing import Dict, List
+
+import numpy as np
+
+try:
+    from pipeline.deduplication.embedding_cache import ARTICLE_EMBEDDINGS, load_article_embeddings
+except ImportError:
+    from deduplication.embedding_cache import ARTICLE_EMBEDDINGS, load_article_embeddings
+
+# ─── CONFIGURATION ─────────────────────────────────────────────────────────
+MIN_SCORE = 0.25   # cosine to the nearest centroid below which the keyword rules decide
+# ────────────────────────────────────────────────────────────────────────────
+
+# Matched against the title and source as written; only "Act" is case-sensitive,
+# so "the EU AI Act" is policy but "model acts as an agent" is not
+_KEYWORD_RULES = (
+    ("OPEN SOURCE", re.compile(r"github|open[- ]source", re.I)),
+    ("AI RESEARCH", re.compile(r"\b(paper|arxiv|benchmark|study|research)", re.I)),
+    ("POLICY",      re.compile(r"\bAct\b|\b(?i:laws?|policy|policies|regulat\w*)\b")),
+    ("PRODUCT",     re.compile(r"\b(launch|release|ship|beta|announce)", re.I)),
+)
+
+
+def guess_category(title: str, source: str) -> str:
+    t = f"{title or ''} {source or ''}"
+    for category, pattern in _KEYWORD_RULES:
+        if pattern.search(t):
+            return category
+    return "TOOLS"
+
+
+def categorize(items: List[Dict], path: str = ARTICLE_EMBEDDINGS) -> List[str]:
+    """
+    One category per item, in order: the nearest centroid to the item's
+    stored embedding, else guess_category().
+    """
+    found: Dict[int, str] = {}
+    stored = load_article_embeddings(path)
+    if stored is not None and len(stored["categories"]):
+        row_of = {url: i for i, url in enumerate(stored["urls"].tolist())}
+        positions = [i for i, a in enumerate(items) if a.get("url") in row_of]
+        if positions:
+            embs = stored["vectors"][[row_of[items[i]["url"]] for i in positions]].astype(np.float32)
+            scores = embs @ stored["centroids"].T
+            best = scores.argmax(axis=1)
+            names = stored["categories"].tolist()
+            for i, b, score in zip(positions, best, scores[np.arange(len(best)), best]):
+                if score >= MIN_SCORE:
+                    found[i] = names[b]
+        print(f"[CATEGORY] {len(found)}/{len(items)} stories placed by embedding.")
+    return [found.get(i) or guess_category(a.get("title", ""), a.get("source_platform", ""))
+            for i, a in enumerate(items)]
@@ -0,0 +1,58 @@
+# pipeline/storage/keys.py
+# Stable identity keys for articles: canonical URL and normalized content hash.
+
+import hashlib
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "ref_url", "cmpid", "smid", "ncid", "_hsenc", "_hsmi",
+    "spm", "trk", "si",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "at_")
+
+_WS = re.compile(r"\s+")
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL so the same story from different sources compares equal:
+    https scheme, lowercase host without "www." or default port, no fragment,
+    no tracking parameters, remaining parameters sorted, no trailing slash.
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if not parts.netloc:
+        return url  # relative or scheme-less; nothing safe to normalize
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    port = parts.port if parts.port not in (None, 80, 443) else None
+    netloc = f"{host}:{port}" if port else host
+
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ]
+    path = parts.path.rstrip("/") or "/"
+    scheme = "https" if parts.scheme in ("http", "https", "") else parts.scheme.lower()
+    return urlunsplit((scheme, netloc, path, urlencode(sorted(query)), ""))
+
+
+def normalize_text(text: str) -> str:
+    return _WS.sub(" ", (text or "")).strip().lower()
+
+
+def content_hash(title: str, content: str) -> str:
+    """
+    SHA-1 of the case- and whitespace-normalized title and content.
+    """
+    key = normalize_text(title) + "\n" + normalize_text(content)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
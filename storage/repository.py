@@ -0,0 +1,191 @@
+# pipeline/storage/repository.py
+# Local SQLite article repository so stages query what they need instead of
+# rescanning every dated JSON file.
+
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from contracts.records import iter_records, is_record_file
+from storage.keys import canonical_url, content_hash, normalize_text
+from storage.sqlite_util import connect
+
+DB_PATH = "storage/articles.db"
+
+# Columns stored directly; any other article fields go into `extra` as JSON
+ARTICLE_FIELDS = ("title", "url", "content", "published_date", "source_platform")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id              INTEGER PRIMARY KEY,
+    canonical_url   TEXT NOT NULL UNIQUE,
+    content_hash    TEXT NOT NULL,
+    title           TEXT,
+    url             TEXT,
+    content         TEXT,
+    published_date  TEXT,
+    source_platform TEXT,
+    extra           TEXT,
+    ingested_at     TEXT NOT NULL,
+    dedup_status    TEXT NOT NULL DEFAULT 'pending',   -- pending | unique | duplicate
+    summary_status  TEXT NOT NULL DEFAULT 'pending'    -- pending | done
+);
+CREATE INDEX IF NOT EXISTS idx_articles_content_hash ON articles(content_hash);
+CREATE INDEX IF NOT EXISTS idx_articles_published    ON articles(published_date);
+CREATE INDEX IF NOT EXISTS idx_articles_source       ON articles(source_platform);
+CREATE INDEX IF NOT EXISTS idx_articles_dedup        ON articles(dedup_status, id);
+
+CREATE TABLE IF NOT EXISTS imported_files (
+    path        TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    mtime       REAL NOT NULL,
+    imported_at TEXT NOT NULL
+);
+"""
+
+
+class ArticleRepository:
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self.conn = connect(path, SCHEMA, wal=True, row_factory=sqlite3.Row)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ─── writes ─────────────────────────────────────────────────────────
+    def upsert(self, articles: Iterable[Dict]) -> int:
+        """
+        Insert articles not already stored (by canonical URL, or by content
+        hash for articles without a URL); returns how many were new.
+        Existing rows, and their stage status, are untouched. Articles with
+        neither a URL nor any text are skipped.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        rows = []
+        hashed = skipped = 0
+        for art in articles:
+            url = art.get("url") or ""
+            chash = content_hash(art.get("title", ""), art.get("content", ""))
+            key = canonical_url(url)
+            if not key:
+                if not (normalize_text(art.get("title", "")) or normalize_text(art.get("content", ""))):
+                    skipped += 1
+                    continue
+                key = f"hash:{chash}"
+                hashed += 1
+            extra = {k: v for k, v in art.items() if k not in ARTICLE_FIELDS}
+            rows.append((
+                key,
+                chash,
+                art.get("title"), url, art.get("content"),
+                art.get("published_date"), art.get("source_platform"),
+                json.dumps(extra, ensure_ascii=False) if extra else None,
+                now,
+            ))
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO articles (canonical_url, content_hash, title, url, content,"
+                " published_date, source_platform, extra, ingested_at) VALUES (?,?,?,?,?,?,?,?,?)",
+                rows,
+            )
+            added = self.conn.total_changes - before
+        if hashed or skipped:
+            print(f"[REPO] {hashed} articles without a URL keyed by content hash; "
+                  f"{skipped} without a URL or text skipped.")
+        return added
+
+    def import_file(self, path: str) -> Optional[int]:
+        """
+        Upsert a record file unless it is unchanged since its last import.
+        Returns the number of new articles, or None if the file was skipped.
+        """
+        st = os.stat(path)
+        row = self.conn.execute("SELECT size, mtime FROM imported_files WHERE path = ?", (path,)).fetchone()
+        if row and row["size"] == st.st_size and row["mtime"] == st.st_mtime:
+            return None
+        added = self.upsert(iter_records(path))
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO imported_files (path, size, mtime, imported_at) VALUES (?,?,?,?)",
+                (path, st.st_size, st.st_mtime, datetime.now(timezone.utc).isoformat()),
+            )
+        return added
+
+    def import_folder(self, folder_path: str) -> int:
+        """
+        Import every new or changed record file in folder_path.
+        """
+        added = 0
+        for fname in sorted(os.listdir(folder_path)):
+            if is_record_file(fname):
+                added += self.import_file(os.path.join(folder_path, fname)) or 0
+        return added
+
+    def set_dedup_status(self, ids: List[int], status: str) -> None:
+        with self.conn:
+            self.conn.executemany("UPDATE articles SET dedup_status = ? WHERE id = ?",
+                                  [(status, i) for i in ids])
+
+    def set_summary_status(self, urls: List[str], status: str = "done") -> None:
+        with self.conn:
+            self.conn.executemany("UPDATE articles SET summary_status = ? WHERE canonical_url = ?",
+                                  [(status, canonical_url(u)) for u in urls])
+
+    # ─── reads ──────────────────────────────────────────────────────────
+    def _to_article(self, row: sqlite3.Row) -> Dict:
+        art = {k: row[k] for k in ARTICLE_FIELDS}
+        if row["extra"]:
+            art.update(json.loads(row["extra"]))
+        art["id"] = row["id"]
+        return art
+
+    def iter_articles(self, since: Optional[str] = None, dedup_status: Optional[str] = None,
+                      source: Optional[str] = None, page_size: int = 1000) -> Iterator[Dict]:
+        """
+        Stream matching articles in insertion order. Pages by id, so callers
+        may update the rows they've been given while iterating.
+        """
+        where, params = ["id > ?"], []
+        if since:
+            where.append("published_date >= ?")
+            params.append(since)
+        if dedup_status:
+            where.append("dedup_status = ?")
+            params.append(dedup_status)
+        if source:
+            where.append("source_platform = ?")
+            params.append(source)
+        sql = f"SELECT * FROM articles WHERE {' AND '.join(where)} ORDER BY id LIMIT ?"
+
+        last_id = 0
+        while True:
+            rows = self.conn.execute(sql, [last_id, *params, page_size]).fetchall()
+            for row in rows:
+                yield self._to_article(row)
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]["id"]
+
+    def count(self, dedup_status: Optional[str] = None) -> int:
+        if dedup_status:
+            return self.conn.execute("SELECT COUNT(*) FROM articles WHERE dedup_status = ?",
+                                     (dedup_status,)).fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def find_by_url(self, url: str) -> Optional[Dict]:
+        row = self.conn.execute("SELECT * FROM articles WHERE canonical_url = ?",
+                                (canonical_url(url),)).fetchone()
+        return self._to_article(row) if row else None
+
+    def has_content_hash(self, digest: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM articles WHERE content_hash = ? LIMIT 1",
+                                 (digest,)).fetchone() is not None
@@ -0,0 +1,35 @@
+# pipeline/storage/sqlite_util.py
+# Connection setup and chunked `IN (?, …)` queries shared by the SQLite
+# stores (articles, dedup sidecars, summary and image caches).
+
+import os
+import sqlite3
+from typing import Iterable, Iterator, List, Tuple
+
+SQL_PARAM_CHUNK = 500   # stay well under SQLite's bound-parameter limit
+
+
+def connect(path: str, schema: str, wal: bool = False, row_factory=None) -> sqlite3.Connection:
+    """
+    Open `path` (creating its directory) and apply `schema`; `wal` switches
+    the file to write-ahead logging so readers don't block the writer.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    if wal:
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(schema)
+    return conn
+
+
+def in_chunks(values: Iterable) -> Iterator[Tuple[List, str]]:
+    """
+    Split `values` into (chunk, placeholders) pairs for `... IN ({marks})`
+    queries that stay under SQL_PARAM_CHUNK bound parameters each.
+    """
+    values = list(values)
+    for i in range(0, len(values), SQL_PARAM_CHUNK):
+        chunk = values[i : i + SQL_PARAM_CHUNK]
+        yield chunk, ",".join("?" * len(chunk))
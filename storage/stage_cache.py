@@ -0,0 +1,154 @@
+# pipeline/storage/stage_cache.py
+# Skip-if-unchanged memoization for pipeline stages. A stage fingerprints its
+# inputs, config constants and source code; if the fingerprint matches the
+# last successful run and that run's outputs are still on disk unmodified,
+# the stage reuses them instead of recomputing.
+
+import ast
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+CACHE_PATH = "storage/stage_cache.json"
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_READ_CHUNK = 1 << 20
+
+
+def file_digest(path: str) -> Optional[str]:
+    """
+    SHA-256 of a file's bytes, or None if it doesn't exist.
+    """
+    if not os.path.isfile(path):
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_READ_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class NothingNew(Exception):
+    """
+    Raised by a stage when its input holds nothing an earlier successful run
+    hasn't already handed on. The later stages are skipped; it is not a failure.
+    """
+
+
+def records_digest(records: Iterable[Dict], volatile: Iterable[str] = ()) -> str:
+    """
+    SHA-256 of in-memory records, independent of dict key order and of the
+    `volatile` fields (e.g. timestamps stamped at fetch time).
+    """
+    volatile = set(volatile)
+    h = hashlib.sha256()
+    for rec in records:
+        rec = {k: v for k, v in rec.items() if k not in volatile}
+        h.update(json.dumps(rec, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def _module_file(name: str) -> Optional[str]:
+    parts = name.split(".")
+    if parts[0] == "pipeline":
+        parts = parts[1:]
+    base = os.path.join(PROJECT_ROOT, *parts) if parts else PROJECT_ROOT
+    for path in (base + ".py", os.path.join(base, "__init__.py")):
+        if parts and os.path.isfile(path):
+            return path
+    return None
+
+
+def code_files(*paths: str) -> List[str]:
+    """
+    `paths` plus every project module they import, directly or indirectly,
+    for a stage's fingerprint. Imports inside functions and try blocks count;
+    third-party modules are left out.
+    """
+    found, todo = set(), [os.path.abspath(p) for p in paths]
+    while todo:
+        path = todo.pop()
+        if path in found:
+            continue
+        found.add(path)
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+        package = os.path.relpath(os.path.dirname(path), PROJECT_ROOT).replace(os.sep, ".")
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                base = node.module or ""
+                if node.level:
+                    anchor = package.split(".")[: len(package.split(".")) - node.level + 1]
+                    base = ".".join(anchor + ([base] if base else []))
+                # `from a import b` may name the submodule a.b or an attribute of a
+                names = [f"{base}.{alias.name}" for alias in node.names] + [base]
+            else:
+                continue
+            for name in names:
+                module = _module_file(name)
+                if module:
+                    todo.append(module)
+    return sorted(found)
+
+
+def fingerprint(inputs: Iterable[str] = (), records: Optional[Iterable[Dict]] = None,
+                config: Optional[Dict] = None, code: Iterable[str] = (), volatile: Iterable[str] = ()) -> str:
+    """
+    One digest over input files, in-memory records, config values and the
+    stage's source files. Any change to any of them, other than to a
+    `volatile` record field, changes the fingerprint.
+    """
+    parts = {
+        "inputs": {p: file_digest(p) for p in inputs},
+        "records": records_digest(records, volatile) if records is not None else None,
+        "config": config or {},
+        "code": {p: file_digest(p) for p in code},
+    }
+    blob = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+class StageCache:
+    """
+    Fingerprint and output digests of each stage's last successful run.
+    """
+    def __init__(self, path: str = CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def is_fresh(self, stage: str, fp: str) -> bool:
+        """
+        True if `stage` last ran with fingerprint `fp` and its outputs are
+        still exactly what that run wrote.
+        """
+        entry = self._load().get(stage)
+        if not entry or entry.get("fingerprint") != fp:
+            return False
+        return all(file_digest(p) == digest for p, digest in entry.get("outputs", {}).items())
+
+    def record(self, stage: str, fp: str, outputs: List[str]) -> None:
+        with self._lock:
+            entries = self._load()
+            entries[stage] = {
+                "fingerprint": fp,
+                "outputs": {p: file_digest(p) for p in outputs},
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+            }
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp, self.path)
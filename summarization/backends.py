@@ -0,0 +1,105 @@
+# pipeline/summarization/backends.py
+# Inference backends for the summarization model on CPU runners: eager fp32
+# torch, torch with int8 dynamic quantization of the encoder and decoder
+# Linear layers, or an ONNX Runtime export with int8 dynamic quantization.
+# Every backend returns a transformers summarization pipeline, so callers
+# don't change.
+#
+#   SUMMARY_BACKEND=torch | torch-int8 | onnx
+#
+# The "onnx" backend needs `pip install "optimum[onnxruntime]"`; the export
+# and quantization run once and are kept under ONNX_DIR.
+
+import os
+
+# ─── CONFIGURATION ─────────────────────────────────────────────────────────
+BACKENDS  = ("torch", "torch-int8", "onnx")
+ONNX_DIR  = os.getenv("SUMMARY_ONNX_DIR", os.path.join(os.path.expanduser("~"), ".cache", "newsletter-onnx"))
+# ────────────────────────────────────────────────────────────────────────────
+
+ONNX_PARTS = ("encoder_model", "decoder_model", "decoder_with_past_model")
+
+
+def configured_backend() -> str:
+    backend = os.getenv("SUMMARY_BACKEND", "torch").lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"SUMMARY_BACKEND must be one of {BACKENDS}, got '{backend}'.")
+    return backend
+
+
+def _torch_pipeline(model_name: str):
+    from transformers import pipeline
+    return pipeline("summarization", model=model_name)
+
+
+def _torch_int8_pipeline(model_name: str):
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name).eval()
+    # Encoder and decoder only: lm_head shares its weight with the token
+    # embeddings, and quantizing it would untie them and change the logits
+    for stack in (model.get_encoder(), model.get_decoder()):
+        torch.ao.quantization.quantize_dynamic(stack, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return pipeline("summarization", model=model, tokenizer=AutoTokenizer.from_pretrained(model_name))
+
+
+def onnx_model_dir(model_name: str) -> str:
+    return os.path.join(ONNX_DIR, model_name.replace("/", "--"))
+
+
+def export_onnx_int8(model_name: str) -> str:
+    """
+    Export `model_name` to ONNX and quantize each part to int8, unless that
+    was already done. Returns the directory holding the quantized model.
+    """
+    out_dir = onnx_model_dir(model_name)
+    if all(os.path.exists(os.path.join(out_dir, f"{part}_quantized.onnx")) for part in ONNX_PARTS):
+        return out_dir
+
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    print(f"[MODEL] Exporting {model_name} to ONNX in '{out_dir}' (one-time).")
+    ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True).save_pretrained(out_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(out_dir)
+
+    qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    for part in ONNX_PARTS:
+        quantizer = ORTQuantizer.from_pretrained(out_dir, file_name=f"{part}.onnx")
+        quantizer.quantize(save_dir=out_dir, quantization_config=qconfig)
+    return out_dir
+
+
+def _onnx_pipeline(model_name: str):
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise ImportError('The "onnx" summary backend needs: pip install "optimum[onnxruntime]"') from e
+    from transformers import AutoTokenizer, pipeline
+
+    model_dir = export_onnx_int8(model_name)
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        model_dir,
+        encoder_file_name="encoder_model_quantized.onnx",
+        decoder_file_name="decoder_model_quantized.onnx",
+        decoder_with_past_file_name="decoder_with_past_model_quantized.onnx",
+    )
+    return pipeline("summarization", model=model, tokenizer=AutoTokenizer.from_pretrained(model_dir))
+
+
+_LOADERS = {
+    "torch":      _torch_pipeline,
+    "torch-int8": _torch_int8_pipeline,
+    "onnx":       _onnx_pipeline,
+}
+
+
+def load_summarizer(backend: str, model_name: str):
+    """
+    A transformers summarization pipeline for `model_name` on `backend`.
+    """
+    if backend not in _LOADERS:
+        raise ValueError(f"Unknown summary backend '{backend}'; use one of {BACKENDS}.")
+    return _LOADERS[backend](model_name)
@@ -2,105 +2,288 @@
 
 import os
 import json
-from transformers import pipeline
-import requests
-from bs4 import BeautifulSoup
+import heapq
+import time
+import argparse
+
+try:
+    from contracts.records import RECORD_SUFFIX
+except ImportError:
+    # Fallback if run as a script: add project root to sys.path then retry
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from contracts.records import RECORD_SUFFIX
+from contracts.checks import iter_json_records, load_json_array, ensure_article_fields, ensure_min_count
+from storage.repository import ArticleRepository, DB_PATH
+from storage.stage_cache import StageCache, code_files, fingerprint
+from summarization.summary_cache import SummaryCache, summary_key
+from summarization.images import ImageResolver
+from summarization.backends import configured_backend, load_summarizer
+from summarization.extractive import extractive_summary, keyword_tags
 
 # ─── CONFIGURATION ───────────────────────────────────────────────────
-INPUT_PATH   = "deduplication/unique_articles.json"
+INPUT_PATH   = f"deduplication/unique_articles{RECORD_SUFFIX}"
 OUTPUT_PATH  = "summarization/summaries.json"
 MODEL_NAME   = "sshleifer/distilbart-cnn-12-6"
+SUMMARY_BACKEND = configured_backend()   # SUMMARY_BACKEND: torch | torch-int8 | onnx
 TOP_K        = 20
+BATCH_SIZE   = 8     # articles per generate() call; batches hold similar-length inputs
+CHUNK_TOKENS = 900   # longer inputs are split into windows of at most this many tokens
+CHUNK_OVERLAP = 100  # tokens shared by consecutive windows
+REDUCE_ROUNDS = 3    # after this many rounds, a text still too long is truncated
+EXTRACTIVE_PLATFORMS = ("Twitter/X", "GitHub Trending")   # source_platform prefixes never sent to the model
+EXTRACTIVE_MAX_WORDS = 60   # items with shorter content get an extractive summary
 # ─────────────────────────────────────────────────────────────────────
 
-# Ensure output folder exists
-os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-
-print(f"[MODEL] Loading summarization model: {MODEL_NAME}")
-summarizer = pipeline("summarization", model=MODEL_NAME)
-
-# 1) Load all deduplicated articles
-with open(INPUT_PATH, "r", encoding="utf-8") as f:
-    all_articles = json.load(f)
-print(f"[LOAD] Loaded {len(all_articles)} total articles from '{INPUT_PATH}'.")
-
-# 2) Sort by date descending and keep top K
-all_articles.sort(
-    key=lambda a: a.get("published_date", ""), 
-    reverse=True
-)
-articles = all_articles[:TOP_K]
-print(f"[SELECT] Processing top {len(articles)} articles by date.")
-
-def fetch_image(url: str) -> str | None:
-    """Fetch the Open Graph image URL from the article page, or None."""
-    try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        res = requests.get(url, headers=headers, timeout=5)
-        soup = BeautifulSoup(res.content, "html.parser")
-        og = soup.find("meta", property="og:image")
-        if og and og.get("content"):
-            return og["content"]
-    except Exception as e:
-        print(f"[IMAGE] Failed to fetch image for {url}: {e}")
-    return None
-
-summaries = []
-for idx, art in enumerate(articles, start=1):
-    title = art.get("title", "").strip()
-    content = art.get("content", "").strip()
-    url     = art.get("url", "")
-
-    text = title + "\n\n" + content
-    print(f"[SUMMARIZE] ({idx}/{len(articles)}) {title[:60]}")
-
-    # 3) Summarize
-    try:
-        result = summarizer(
-            text,
-            max_length=100,
-            min_length=20,
-            do_sample=False
-        )[0]
-        summary_text = result["summary_text"].strip()
-    except Exception as e:
-        print(f"[ERROR] Summarization failed for '{title}': {e}")
-        summary_text = ""
-
-    # 4) Fetch article image (fallback to None)
-    image_url = fetch_image(url) if url else None
-
-    summaries.append({
-        "title":           title,
-        "url":             url,
-        "published_date":  art.get("published_date"),
-        "source_platform": art.get("source_platform"),
-        "summary":         summary_text,
-        "image":           image_url
-    })
-
-# 5) Save top-K summaries
-with open(OUTPUT_PATH, "w", encoding="utf-8") as outf:
-    json.dump(summaries, outf, ensure_ascii=False, indent=2)
-print(f"[SAVE] Wrote {len(summaries)} summaries (with images) to '{OUTPUT_PATH}'.")
+_summarizers = {}
 
+def get_summarizer():
+    """The summarization pipeline for SUMMARY_BACKEND, loaded on first use."""
+    if SUMMARY_BACKEND not in _summarizers:
+        print(f"[MODEL] Loading summarization model: {MODEL_NAME} ({SUMMARY_BACKEND})")
+        _summarizers[SUMMARY_BACKEND] = load_summarizer(SUMMARY_BACKEND, MODEL_NAME)
+    return _summarizers[SUMMARY_BACKEND]
 
+# 1) Stream all deduplicated articles, counting as we go
+def _counted(records, counter):
+    for rec in records:
+        counter[0] += 1
+        yield rec
 
-try:
-    from contracts.checks import load_json_array, ensure_article_fields, ensure_min_count, write_json
-except ImportError:
-    # Fallback if run as a script: add project root to sys.path then retry
-    import os, sys
-    sys.path.append(os.path.dirname(__file__))                 # /.../pipeline/summarization
-    sys.path.append(os.path.dirname(os.path.dirname(__file__)))# /.../pipeline
-    from contracts.checks import load_json_array, ensure_article_fields, ensure_min_count, write_json
-    
-OUT = "summarization/summaries.json"
-
-# ... your summarization code that writes OUT ...
-
-# Validate summarization contract:
-summaries = load_json_array(OUT)
-ensure_article_fields(summaries, ["title","url","published_date","source_platform","summary"])
-ensure_min_count(summaries, 5, OUT)
-print("[CONTRACT] Summarization output OK.")
\ No newline at end of file
+# 2) Keep only the top K by date descending (O(K) memory, not O(corpus))
+def select_articles(path: str = INPUT_PATH, top_k: int = TOP_K, records=None) -> list:
+    loaded = [0]
+    articles = heapq.nlargest(
+        top_k,
+        _counted(iter_json_records(path) if records is None else records, loaded),
+        key=lambda a: a.get("published_date", "") or ""
+    )
+    print(f"[LOAD] Loaded {loaded[0]} total articles from '{path if records is None else 'memory'}'.")
+    print(f"[SELECT] Processing top {len(articles)} articles by date.")
+    return articles
+
+GENERATE_KWARGS = dict(max_length=100, min_length=20, do_sample=False)
+
+def length_batches(lengths: list, batch_size: int) -> list:
+    """
+    Group positions into batches of similar length, so little of each
+    batch is padding.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    return [order[i : i + batch_size] for i in range(0, len(order), batch_size)]
+
+def chunk_windows(n_tokens: int, max_tokens: int = CHUNK_TOKENS, overlap: int = CHUNK_OVERLAP) -> list:
+    """
+    (start, end) token windows covering `n_tokens`, each at most `max_tokens`
+    long and overlapping the previous one by `overlap` tokens (at most half
+    a window).
+    """
+    if n_tokens <= max_tokens:
+        return [(0, n_tokens)]
+    overlap = min(overlap, max_tokens // 2)
+    step = max_tokens - overlap
+    starts = range(0, n_tokens - overlap, step)
+    return [(s, min(s + max_tokens, n_tokens)) for s in starts]
+
+def max_input_tokens(tokenizer) -> int:
+    """Window size for the loaded model, leaving room for special tokens."""
+    limit = getattr(tokenizer, "model_max_length", None) or CHUNK_TOKENS
+    return min(CHUNK_TOKENS, limit - 2)
+
+def generate_summaries(texts: list, lengths: list, titles: list, batch_size: int = BATCH_SIZE) -> list:
+    """
+    One generate() pass over `texts`, in length-sorted batches. A batch that
+    fails is retried one item at a time, so a bad input only blanks its own
+    summary.
+    """
+    summarizer = get_summarizer()
+    results = [""] * len(texts)
+    done = 0
+    for batch in length_batches(lengths, batch_size):
+        print(f"[SUMMARIZE] ({done + len(batch)}/{len(texts)}) batch of {len(batch)}, "
+              f"{lengths[batch[0]]}-{lengths[batch[-1]]} tokens")
+        done += len(batch)
+        try:
+            outputs = summarizer([texts[i] for i in batch], batch_size=len(batch), **GENERATE_KWARGS)
+            for i, out in zip(batch, outputs):
+                results[i] = out["summary_text"].strip()
+            continue
+        except Exception as e:
+            print(f"[ERROR] Batch failed ({e}); retrying its {len(batch)} inputs one by one.")
+        for i in batch:
+            try:
+                results[i] = summarizer(texts[i], **GENERATE_KWARGS)[0]["summary_text"].strip()
+            except Exception as e:
+                print(f"[ERROR] Summarization failed for '{titles[i]}': {e}")
+    return results
+
+def summarize_texts(texts: list, titles: list, batch_size: int = BATCH_SIZE) -> list:
+    """
+    Summaries for `texts`, in the same order. Texts longer than the model's
+    input are split into overlapping windows (map); the window summaries of
+    each text are joined and summarized again (reduce), repeating until the
+    joined text fits in one window. Every round is a single batched pass.
+    """
+    if not texts:
+        return []
+    tokenizer = get_summarizer().tokenizer
+    limit = max_input_tokens(tokenizer)
+    results = [""] * len(texts)
+    pending = dict(enumerate(texts))
+    round_no = 0
+    while pending:
+        round_no += 1
+        parts, lengths, owners = [], [], []
+        token_ids = tokenizer(list(pending.values()), add_special_tokens=False)["input_ids"]
+        for i, ids in zip(pending, token_ids):
+            windows = chunk_windows(len(ids), limit, CHUNK_OVERLAP)
+            fits = len(windows) == 1
+            if round_no >= REDUCE_ROUNDS and not fits:
+                print(f"[CHUNK] '{titles[i]}' still {len(ids)} tokens after {round_no - 1} reductions; "
+                      f"truncating to {limit}.")
+                windows = windows[:1]
+            for start, end in windows:
+                parts.append(pending[i] if fits else
+                             tokenizer.decode(ids[start:end], skip_special_tokens=True))
+                lengths.append(end - start)
+                owners.append(i)
+        chunked = len(parts) - len(pending)
+        if chunked:
+            print(f"[CHUNK] Round {round_no}: {len(pending)} texts → {len(parts)} windows "
+                  f"of ≤{limit} tokens.")
+        outputs = generate_summaries(parts, lengths, [titles[i] for i in owners], batch_size)
+
+        pieces = {}
+        for i, out in zip(owners, outputs):
+            pieces.setdefault(i, []).append(out)
+        pending = {}
+        for i, outs in pieces.items():
+            if len(outs) == 1:
+                results[i] = outs[0]
+            elif any(outs):
+                # Reduce: summarize the joined window summaries next round
+                pending[i] = titles[i] + "\n\n" + " ".join(o for o in outs if o)
+    return results
+
+def route(article: dict) -> str:
+    """
+    "extractive" for short or low-value items, "abstractive" for long-form ones.
+    """
+    if (article.get("source_platform") or "").startswith(EXTRACTIVE_PLATFORMS):
+        return "extractive"
+    words = len((article.get("content") or "").split())
+    return "extractive" if words < EXTRACTIVE_MAX_WORDS else "abstractive"
+
+def summarize_articles(articles: list, batch_size: int = BATCH_SIZE) -> list:
+    titles = [art.get("title", "").strip() for art in articles]
+    texts = [t + "\n\n" + art.get("content", "").strip() for t, art in zip(titles, articles)]
+
+    # Resolve article images in the background while the model runs
+    images = ImageResolver().start(art.get("url", "") for art in articles)
+
+    # 3) Route: short or low-value items get an extractive summary, the rest the model
+    tiers = [route(art) for art in articles]
+    summary_texts = [""] * len(articles)
+    tags = [[] for _ in articles]
+    stats = {}
+
+    start = time.perf_counter()
+    extractive_idx = [i for i, tier in enumerate(tiers) if tier == "extractive"]
+    for i in extractive_idx:
+        content = articles[i].get("content", "").strip()
+        body = content if len(content.split()) >= 3 else titles[i]
+        summary_texts[i] = extractive_summary(body)
+        tags[i] = keyword_tags(body)
+    stats["extractive"] = (len(extractive_idx), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    abstractive = [i for i, tier in enumerate(tiers) if tier == "abstractive"]
+
+    # Reuse cached summaries; the model only sees articles not summarized before
+    cache = SummaryCache()
+    settings = dict(GENERATE_KWARGS, chunk_tokens=CHUNK_TOKENS, chunk_overlap=CHUNK_OVERLAP,
+                    backend=SUMMARY_BACKEND)
+    keys = {i: summary_key(texts[i], MODEL_NAME, settings) for i in abstractive}
+    cached = cache.get_many(list(keys.values()))
+    misses = [i for i in abstractive if keys[i] not in cached]
+    print(f"[CACHE] {len(abstractive) - len(misses)}/{len(abstractive)} summaries cached "
+          f"(hit rate {cache.hit_rate():.0%}).")
+
+    # Summarize the rest in length-sorted batches; results come back in article order
+    generated = summarize_texts([texts[i] for i in misses], [titles[i] for i in misses], batch_size)
+    cache.put_many({keys[i]: text for i, text in zip(misses, generated) if text})
+    cache.close()
+    for i in abstractive:
+        summary_texts[i] = cached.get(keys[i], "")
+    for i, text in zip(misses, generated):
+        summary_texts[i] = text
+    for i in abstractive:
+        tags[i] = keyword_tags(texts[i])
+    stats["abstractive"] = (len(abstractive), time.perf_counter() - start)
+    print("[ROUTER] " + " | ".join(f"{tier}: {n} items in {secs:.2f}s" for tier, (n, secs) in stats.items()))
+
+    # 4) Collect article images (fallback to None)
+    image_urls = images.results()
+
+    summaries = []
+    for art, title, summary_text, item_tags in zip(articles, titles, summary_texts, tags):
+        url = art.get("url", "")
+        image_url = image_urls.get(url) if url else None
+
+        summaries.append({
+            "title":           title,
+            "url":             url,
+            "published_date":  art.get("published_date"),
+            "source_platform": art.get("source_platform"),
+            "summary":         summary_text,
+            "tags":            item_tags,
+            "image":           image_url
+        })
+    return summaries
+
+def run(input_path: str = INPUT_PATH, output_path: str = OUTPUT_PATH, top_k: int = TOP_K,
+        articles: list = None, force: bool = False) -> list:
+    """
+    Summarize the newest `top_k` deduplicated articles, read from
+    `input_path` unless `articles` are handed over in memory. Reuses the
+    last output when nothing it depends on changed, unless `force`.
+    """
+    cache = StageCache()
+    fp = fingerprint(
+        inputs=[input_path] if articles is None else [],
+        records=articles,
+        config={"MODEL_NAME": MODEL_NAME, "SUMMARY_BACKEND": SUMMARY_BACKEND, "TOP_K": top_k,
+                "output_path": output_path},
+        code=code_files(__file__),
+    )
+    if not force and cache.is_fresh("summarization", fp):
+        print(f"[CACHE] Inputs unchanged since the last run; reusing '{output_path}'.")
+        return load_json_array(output_path)
+
+    # Ensure output folder exists
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    summaries = summarize_articles(select_articles(input_path, top_k, records=articles))
+
+    # 5) Save top-K summaries
+    with open(output_path, "w", encoding="utf-8") as outf:
+        json.dump(summaries, outf, ensure_ascii=False, indent=2)
+    print(f"[SAVE] Wrote {len(summaries)} summaries (with images) to '{output_path}'.")
+
+    # 6) Record which articles now have a summary
+    if os.path.exists(DB_PATH):
+        with ArticleRepository() as repo:
+            repo.set_summary_status([s["url"] for s in summaries if s["summary"]])
+
+    # Validate summarization contract:
+    ensure_article_fields(summaries, ["title","url","published_date","source_platform","summary"])
+    ensure_min_count(summaries, 5, output_path)
+    print("[CONTRACT] Summarization output OK.")
+    cache.record("summarization", fp, [output_path])
+    return summaries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize the newest deduplicated articles.")
+    parser.add_argument("--force", action="store_true", help="rerun even if inputs are unchanged")
+    run(force=parser.parse_args().force)
@@ -0,0 +1,86 @@
+# pipeline/summarization/extractive.py
+# Fast extractive tier: sentence extraction with sumy and keyword tags with
+# yake, for items too short or too list-like to be worth the transformer.
+# Both libraries are imported on first use; without them the summary falls
+# back to the lead sentences and the tags to an empty list.
+
+import re
+from typing import List
+
+# ─── CONFIGURATION ─────────────────────────────────────────────────────────
+SUMMARY_SENTENCES = 2    # sentences kept per extractive summary
+TAG_COUNT         = 5    # keyword tags per item
+TAG_MAX_WORDS     = 2    # longest keyword phrase
+# ────────────────────────────────────────────────────────────────────────────
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])")
+_WORD = re.compile(r"\w[\w'-]*")
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE.split(" ".join(text.split())) if s.strip()]
+
+
+class _RegexTokenizer:
+    """
+    sumy tokenizer that needs no NLTK data downloads.
+    """
+    language = "english"
+
+    def to_sentences(self, paragraph: str):
+        return tuple(split_sentences(paragraph))
+
+    def to_words(self, sentence: str):
+        return tuple(_WORD.findall(sentence))
+
+
+_ranker = None
+_extractor = None
+
+
+def _get_ranker():
+    global _ranker
+    if _ranker is None:
+        from sumy.nlp.stemmers import Stemmer
+        from sumy.summarizers.lex_rank import LexRankSummarizer
+        from sumy.utils import get_stop_words
+        _ranker = LexRankSummarizer(Stemmer("english"))
+        _ranker.stop_words = get_stop_words("english")
+    return _ranker
+
+
+def _get_extractor():
+    global _extractor
+    if _extractor is None:
+        import yake
+        _extractor = yake.KeywordExtractor(lan="en", n=TAG_MAX_WORDS, top=TAG_COUNT)
+    return _extractor
+
+
+def extractive_summary(text: str, sentences: int = SUMMARY_SENTENCES) -> str:
+    """
+    The `sentences` most central sentences of `text`, in document order.
+    Text that is already that short is returned as is.
+    """
+    parts = split_sentences(text)
+    if len(parts) <= sentences:
+        return " ".join(parts)
+    try:
+        from sumy.parsers.plaintext import PlaintextParser
+        document = PlaintextParser.from_string(" ".join(parts), _RegexTokenizer()).document
+        return " ".join(str(s) for s in _get_ranker()(document, sentences))
+    except ImportError:
+        return " ".join(parts[:sentences])
+
+
+def keyword_tags(text: str) -> List[str]:
+    """
+    Up to TAG_COUNT keyword phrases for `text`, most relevant first.
+    """
+    if not text.strip():
+        return []
+    try:
+        extractor = _get_extractor()
+    except ImportError:
+        return []
+    return [kw for kw, _ in extractor.extract_keywords(text)]
@@ -0,0 +1,184 @@
+# pipeline/summarization/images.py
+# Open Graph image resolution for summarized articles. Pages are fetched
+# concurrently (bounded per host), only their <head> is read, and results
+# (including "no image") are cached on disk with a TTL.
+
+import codecs
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from data_ingestion.http_client import http_get
+from storage.repository import DB_PATH
+from storage.sqlite_util import connect, in_chunks
+
+# ─── CONFIGURATION ───────────────────────────────────────────────────
+MAX_WORKERS   = 16
+PER_HOST      = 2                    # concurrent requests to any one host
+TIMEOUT       = 5                    # seconds
+HEAD_LIMIT    = 256 * 1024           # stop reading a page after this many bytes
+POSITIVE_TTL  = timedelta(days=30)   # how long a found image is trusted
+NEGATIVE_TTL  = timedelta(days=1)    # how long "no image / fetch failed" is trusted
+USER_AGENT    = "Mozilla/5.0"
+# ─────────────────────────────────────────────────────────────────────
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS image_cache (
+    url        TEXT PRIMARY KEY,
+    image      TEXT,               -- NULL: the page has no usable og:image
+    fetched_at TEXT NOT NULL
+);
+"""
+
+IMAGE_PROPERTIES = ("og:image", "og:image:url", "og:image:secure_url", "twitter:image")
+
+
+class _HeadDone(Exception):
+    pass
+
+
+class _MetaImageParser(HTMLParser):
+    """
+    Collects image meta tags and stops at the end of <head>.
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.found: Dict[str, str] = {}
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            raise _HeadDone
+        if tag != "meta":
+            return
+        attrs = dict(attrs)
+        key = (attrs.get("property") or attrs.get("name") or "").lower()
+        if key in IMAGE_PROPERTIES and attrs.get("content"):
+            self.found.setdefault(key, attrs["content"].strip())
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            raise _HeadDone
+
+    def image(self) -> Optional[str]:
+        for key in IMAGE_PROPERTIES:
+            if self.found.get(key):
+                return self.found[key]
+        return None
+
+
+def parse_head_image(chunks: Iterable[bytes], encoding: str = "utf-8") -> Optional[str]:
+    """
+    Feed page bytes to the meta parser until </head>, <body> or HEAD_LIMIT.
+    """
+    parser = _MetaImageParser()
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    read = 0
+    try:
+        for chunk in chunks:
+            parser.feed(decoder.decode(chunk))
+            read += len(chunk)
+            if read >= HEAD_LIMIT:
+                break
+    except _HeadDone:
+        pass
+    return parser.image()
+
+
+def fetch_og_image(url: str) -> Optional[str]:
+    """
+    Stream the page and return its og:image URL (absolute), or None.
+    Raises on network errors so callers can tell "failed" from "no image".
+    """
+    with http_get(url, headers={"User-Agent": USER_AGENT}, timeout=TIMEOUT, stream=True) as res:
+        res.raise_for_status()
+        # requests assumes ISO-8859-1 for text/* without a charset; pages are mostly UTF-8
+        declared = "charset" in res.headers.get("Content-Type", "").lower()
+        image = parse_head_image(res.iter_content(chunk_size=16 * 1024),
+                                 res.encoding if declared and res.encoding else "utf-8")
+    return urljoin(url, image) if image else None
+
+
+class ImageCache:
+    def __init__(self, path: str = DB_PATH):
+        self.conn = connect(path, SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get_many(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Cached results still within their TTL; a value of None is a cached miss.
+        """
+        now = datetime.now(timezone.utc)
+        fresh = {}
+        for chunk, marks in in_chunks(urls):
+            for url, image, fetched_at in self.conn.execute(
+                    f"SELECT url, image, fetched_at FROM image_cache WHERE url IN ({marks})", chunk):
+                ttl = POSITIVE_TTL if image else NEGATIVE_TTL
+                if now - datetime.fromisoformat(fetched_at) < ttl:
+                    fresh[url] = image
+        return fresh
+
+    def put_many(self, results: Dict[str, Optional[str]]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO image_cache (url, image, fetched_at) VALUES (?, ?, ?)",
+                                  [(url, image, now) for url, image in results.items()])
+
+
+class ImageResolver:
+    """
+    Resolves og:image URLs in background threads. `start()` returns at once,
+    so page fetches overlap with whatever the caller does next (e.g. model
+    inference); `results()` waits for them and updates the cache.
+    """
+    def __init__(self, cache: Optional[ImageCache] = None, max_workers: int = MAX_WORKERS,
+                 per_host: int = PER_HOST):
+        self._owns_cache = cache is None
+        self.cache = cache or ImageCache()
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self._host_slots: Dict[str, threading.Semaphore] = {}
+        self._slots_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self._cached: Dict[str, Optional[str]] = {}
+
+    def _slot(self, url: str) -> threading.Semaphore:
+        host = urlparse(url).netloc.lower()
+        with self._slots_lock:
+            return self._host_slots.setdefault(host, threading.Semaphore(self.per_host))
+
+    def _resolve(self, url: str) -> Optional[str]:
+        with self._slot(url):
+            try:
+                return fetch_og_image(url)
+            except Exception as e:
+                print(f"[IMAGE] Failed to fetch image for {url}: {e}")
+                return None
+
+    def start(self, urls: Iterable[str]) -> "ImageResolver":
+        urls = list(dict.fromkeys(u for u in urls if u))
+        self._cached = self.cache.get_many(urls)
+        pending = [u for u in urls if u not in self._cached]
+        print(f"[IMAGE] {len(self._cached)} cached, fetching {len(pending)} pages.")
+        if pending:
+            self._executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending)),
+                                                thread_name_prefix="og-image")
+            self._futures = {u: self._executor.submit(self._resolve, u) for u in pending}
+        return self
+
+    def results(self) -> Dict[str, Optional[str]]:
+        fetched = {u: f.result() for u, f in self._futures.items()}
+        if self._executor is not None:
+            self._executor.shutdown()
+        self.cache.put_many(fetched)
+        if self._owns_cache:
+            self.cache.close()
+        return {**self._cached, **fetched}
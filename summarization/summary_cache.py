@@ -0,0 +1,70 @@
+# pipeline/summarization/summary_cache.py
+# Persistent LRU cache of generated summaries, keyed by the exact input text
+# and the model settings that produced them.
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from storage.repository import DB_PATH
+from storage.sqlite_util import connect, in_chunks
+
+MAX_ENTRIES = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS summary_cache (
+    key       TEXT PRIMARY KEY,   -- sha256 of model settings + input text
+    summary   TEXT NOT NULL,
+    last_used TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_summary_cache_last_used ON summary_cache(last_used);
+"""
+
+
+def summary_key(text: str, model_name: str, generate_kwargs: Dict) -> str:
+    settings = json.dumps({"model": model_name, **generate_kwargs}, sort_keys=True)
+    return hashlib.sha256(f"{settings}\0{text}".encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    def __init__(self, path: str = DB_PATH, max_entries: int = MAX_ENTRIES):
+        self.conn = connect(path, SCHEMA)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        """
+        Cached summaries for the keys that have one; marks them recently used.
+        """
+        found = {}
+        for chunk, marks in in_chunks(keys):
+            found.update(self.conn.execute(
+                f"SELECT key, summary FROM summary_cache WHERE key IN ({marks})", chunk))
+        now = datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            self.conn.executemany("UPDATE summary_cache SET last_used = ? WHERE key = ?",
+                                  [(now, k) for k in found])
+        self.hits += sum(1 for k in keys if k in found)
+        self.misses += sum(1 for k in keys if k not in found)
+        return found
+
+    def put_many(self, items: Dict[str, str]) -> None:
+        """
+        Store summaries, then evict the least recently used beyond max_entries.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO summary_cache (key, summary, last_used) VALUES (?, ?, ?)",
+                                  [(k, v, now) for k, v in items.items()])
+            self.conn.execute(
+                "DELETE FROM summary_cache WHERE key IN (SELECT key FROM summary_cache"
+                " ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
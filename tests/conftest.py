@@ -0,0 +1,59 @@
+# pipeline/tests/conftest.py
+# Tests import the stages as packages, as the pipeline does when run from
+# the project root.
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+class StubEmbedder:
+    """
+    Stands in for the SBERT model: a fixed random unit vector per distinct
+    text, so different texts are far apart and repeats are identical.
+    """
+    dim = 64
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
+        import zlib
+
+        import numpy as np
+        return np.vstack([np.random.default_rng(zlib.crc32(t.encode("utf-8"))).standard_normal(self.dim)
+                          for t in texts]).astype(np.float32)
+
+
+def make_articles(n, start=0, source="NewsAPI"):
+    """
+    `n` distinct articles whose texts share no words with each other.
+    """
+    return [{
+        "title": f"Story {i}",
+        "url": f"https://example.com/story-{i}",
+        "content": " ".join(f"w{i}x{j}" for j in range(40)),
+        "published_date": "2026-10-12T08:00:00+00:00",
+        "source_platform": source,
+    } for i in range(start, start + n)]
+
+
+@pytest.fixture
+def dedup_env(tmp_path, monkeypatch):
+    """
+    deduplication.engine with fresh state under `tmp_path` and StubEmbedder
+    in place of the model.
+    """
+    from deduplication import engine
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(engine.RAW_FOLDER)
+    monkeypatch.setattr(engine, "_model", StubEmbedder())
+    for name, value in (("_index", None), ("_embedding_cache", None), ("excluded_ids", []),
+                        ("report_queries", []), ("report_query_ids", [])):
+        monkeypatch.setattr(engine, name, value)
+    return engine
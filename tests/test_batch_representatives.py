@@ -0,0 +1,42 @@
+# pipeline/tests/test_batch_representatives.py
+# The blocked within-batch pass must keep exactly the rows an all-pairs pass
+# keeps, including when a duplicate and its original fall in different blocks.
+
+import numpy as np
+import pytest
+
+from deduplication.engine import batch_representatives
+
+THRESHOLD = 0.9
+
+
+def unit(rows):
+    rows = np.asarray(rows, dtype=np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def reference(embs, threshold):
+    kept = []
+    for i, row in enumerate(embs):
+        if not kept or (embs[kept] @ row).max() < threshold:
+            kept.append(i)
+    return kept
+
+
+def test_duplicates_across_block_boundaries():
+    rng = np.random.default_rng(0)
+    embs = unit(rng.standard_normal((14, 32)))
+    # With block=4, each copy sits in a later block than its original
+    embs[4], embs[9], embs[13] = embs[3], embs[0], embs[8]
+    kept = batch_representatives(embs, THRESHOLD, block=4)
+    assert kept == [i for i in range(14) if i not in (4, 9, 13)]
+
+
+@pytest.mark.parametrize("block", [1, 3, 4, 7, 64])
+def test_blocked_matches_all_pairs(block):
+    rng = np.random.default_rng(block)
+    base = unit(rng.standard_normal((20, 16)))
+    # Near-copies of random earlier rows, scattered through the batch
+    copies = unit(base[rng.integers(0, 20, 15)] + 0.01 * rng.standard_normal((15, 16)))
+    embs = np.vstack([base, copies])[rng.permutation(35)]
+    assert batch_representatives(embs, THRESHOLD, block=block) == reference(embs, THRESHOLD)
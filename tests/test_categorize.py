@@ -0,0 +1,50 @@
+# pipeline/tests/test_categorize.py
+# Section for each story: nearest stored centroid, else the keyword fallback.
+
+import numpy as np
+import pytest
+
+from deduplication.categories import CATEGORY_PROTOTYPES
+from deduplication.embedding_cache import save_article_embeddings
+from rendering.categorize import categorize, guess_category
+
+
+@pytest.mark.parametrize("title, source, expected", [
+    ("EU lawmakers finalise the AI Act", "NewsAPI", "POLICY"),
+    ("New state law targets deepfakes", "Reddit", "POLICY"),
+    ("Regulators open a probe into chatbots", "NewsData", "POLICY"),
+    ("The model acts as a coding agent", "NewsAPI", "TOOLS"),
+    ("How an assistant acts on your calendar", "Webz.io", "TOOLS"),
+    ("Startup launches an AI notebook", "NewsAPI", "PRODUCT"),
+    ("A paper on sparse attention", "arXiv", "AI RESEARCH"),
+    ("owner/repo", "GitHub Trending", "OPEN SOURCE"),
+])
+def test_guess_category(title, source, expected):
+    assert guess_category(title, source) == expected
+
+
+def test_categorize_uses_stored_embeddings(tmp_path):
+    path = str(tmp_path / "unique_embeddings.npz")
+    names = list(CATEGORY_PROTOTYPES)
+    centroids = np.eye(len(names), 8, dtype=np.float32)
+    vectors = np.zeros((3, 8), dtype=np.float32)
+    vectors[0, names.index("POLICY")] = 1.0               # nearest: POLICY
+    vectors[1, names.index("OPEN SOURCE")] = 0.9          # nearest: OPEN SOURCE
+    vectors[1, names.index("TOOLS")] = 0.4
+    vectors[2, 7] = 1.0                                   # close to no centroid
+    save_article_embeddings(path, "stub", ["u0", "u1", "u2"], vectors, names, centroids)
+
+    items = [
+        {"url": "u0", "title": "Startup launches a product", "source_platform": "NewsAPI"},
+        {"url": "u1", "title": "A paper on agents", "source_platform": "arXiv"},
+        {"url": "u2", "title": "New AI law passes", "source_platform": "NewsAPI"},
+        {"url": "missing", "title": "Study of benchmarks", "source_platform": "arXiv"},
+    ]
+    # The embedding wins over the keywords where it is confident; the rest
+    # (a score under MIN_SCORE, or no stored embedding) fall back to them
+    assert categorize(items, path) == ["POLICY", "OPEN SOURCE", "POLICY", "AI RESEARCH"]
+
+
+def test_categorize_without_embeddings_uses_keywords(tmp_path):
+    items = [{"url": "u0", "title": "EU AI Act vote", "source_platform": "NewsAPI"}]
+    assert categorize(items, str(tmp_path / "missing.npz")) == ["POLICY"]
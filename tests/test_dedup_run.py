@@ -0,0 +1,82 @@
+# pipeline/tests/test_dedup_run.py
+# A dedup run hands each unique article on once; a run with nothing new
+# raises NothingNew instead of re-emitting the last output. Articles outside
+# the retention window no longer count as duplicates at any tier.
+
+import pytest
+
+from conftest import make_articles
+from storage.stage_cache import NothingNew
+
+
+def test_first_run_returns_uniques(dedup_env):
+    articles = make_articles(6)
+    unique = dedup_env.run(articles=articles + [dict(articles[0])])
+    assert sorted(a["url"] for a in unique) == sorted(a["url"] for a in articles)
+
+
+def test_same_input_again_is_nothing_new(dedup_env):
+    dedup_env.run(articles=make_articles(6))
+    with pytest.raises(NothingNew, match="unchanged since the last run"):
+        dedup_env.run(articles=make_articles(6))
+
+
+def test_fetch_time_stamps_do_not_change_the_fingerprint(dedup_env):
+    articles = make_articles(6, source="GitHub Trending (Overall)")
+    restamped = [dict(a, published_date="2026-10-19T06:00:00+00:00") for a in articles]
+    assert dedup_env.stage_fingerprint(articles) == dedup_env.stage_fingerprint(restamped)
+
+
+def test_only_stored_articles_is_nothing_new(dedup_env):
+    dedup_env.run(articles=make_articles(6))
+    before = open(dedup_env.DEDUP_OUT, "rb").read()
+    with pytest.raises(NothingNew, match="No new articles"):
+        dedup_env.run(articles=make_articles(3))
+    assert open(dedup_env.DEDUP_OUT, "rb").read() == before
+
+
+def test_new_articles_are_handed_on_alone(dedup_env):
+    dedup_env.run(articles=make_articles(6))
+    unique = dedup_env.run(articles=make_articles(6) + make_articles(5, start=6))
+    assert sorted(a["url"] for a in unique) == sorted(a["url"] for a in make_articles(5, start=6))
+
+
+def age_everything(engine):
+    """
+    Date every indexed vector and seen key far outside the retention window.
+    """
+    import sqlite3
+    from storage.repository import DB_PATH
+    with sqlite3.connect(DB_PATH) as conn:
+        conn.execute("UPDATE dedup_vectors SET added_at = '2000-01-01T00:00:00+00:00'")
+        conn.execute("UPDATE dedup_seen SET first_seen = '2000-01-01T00:00:00+00:00'")
+
+
+def reposted(articles, edit=False):
+    return [dict(a, url=a["url"] + "-repost", content=a["content"] + (" edited" if edit else ""))
+            for a in articles]
+
+
+def test_expired_near_copies_are_not_lexical_duplicates(dedup_env):
+    old = make_articles(6)
+    dedup_env.run(articles=old)
+    age_everything(dedup_env)
+    # Every old vector expires at once, so this run compacts them away
+    unique = dedup_env.run(articles=reposted(old, edit=True))
+    assert len(unique) == len(old)
+
+
+def test_expired_exact_repeats_pass_the_prefilter(dedup_env):
+    old = make_articles(6)
+    dedup_env.run(articles=old)
+    age_everything(dedup_env)
+    unique = dedup_env.run(articles=reposted(old))
+    assert len(unique) == len(old)
+
+
+def test_recent_repeats_are_still_duplicates(dedup_env):
+    old = make_articles(6)
+    dedup_env.run(articles=old)
+    fresh = make_articles(5, start=6)
+    unique = dedup_env.run(articles=old + reposted(old[:2]) + reposted(old[2:4], edit=True) + fresh)
+    assert sorted(a["url"] for a in unique) == sorted(a["url"] for a in fresh)
@@ -0,0 +1,40 @@
+# pipeline/tests/test_http_client.py
+# A server's Retry-After can't keep a fetch sleeping past its runner deadline.
+
+import pytest
+from urllib3 import HTTPResponse
+
+from data_ingestion import http_client
+from data_ingestion.http_client import MAX_RETRIES, RETRY_SLEEP_MAX, get_session
+from data_ingestion.runner import DEFAULT_SOURCE_TIMEOUT
+
+
+def session_retry():
+    return get_session().get_adapter("https://example.com").max_retries
+
+
+def test_retry_sleeps_fit_inside_the_source_deadline():
+    assert MAX_RETRIES * RETRY_SLEEP_MAX < DEFAULT_SOURCE_TIMEOUT
+    assert session_retry().backoff_max <= RETRY_SLEEP_MAX
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("2", 2),
+    ("3600", RETRY_SLEEP_MAX),
+    ("Wed, 21 Oct 2099 07:28:00 GMT", RETRY_SLEEP_MAX),
+])
+def test_retry_after_is_capped(monkeypatch, header, expected):
+    slept = []
+    monkeypatch.setattr("urllib3.util.retry.time.sleep", slept.append)
+    retry = session_retry()
+    response = HTTPResponse(status=429, headers={"Retry-After": header})
+    assert retry.sleep_for_retry(response)
+    # The cap survives the copy urllib3 makes on every retry
+    assert retry.increment("GET", "/", response=response).sleep_for_retry(response)
+    assert slept == [expected, expected]
+
+
+def test_no_retry_after_falls_back_to_backoff():
+    response = HTTPResponse(status=503, headers={})
+    assert session_retry().get_retry_after(response) is None
+    assert isinstance(session_retry(), http_client.CappedRetry)
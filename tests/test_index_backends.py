@@ -0,0 +1,56 @@
+# pipeline/tests/test_index_backends.py
+# Recall reports must not credit an index for finding a query's own vector.
+
+import json
+
+import faiss
+import numpy as np
+
+from conftest import make_articles
+from deduplication.index_backends import recall_report
+
+
+def coarse_ivf(vectors: np.ndarray, ids: np.ndarray):
+    """
+    An IVF index probing one of 64 lists: it always finds a stored vector
+    itself, but misses most of its other neighbours.
+    """
+    quantizer = faiss.IndexFlatIP(vectors.shape[1])
+    ivf = faiss.IndexIVFFlat(quantizer, vectors.shape[1], 64, faiss.METRIC_INNER_PRODUCT)
+    ivf.train(vectors)
+    ivf.nprobe = 1
+    idx = faiss.IndexIDMap2(ivf)
+    idx.add_with_ids(vectors, ids)
+    return idx
+
+
+def test_stored_queries_exclude_their_own_id(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((3000, 32)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    ids = np.arange(1000, 4000, dtype=np.int64)
+    idx = coarse_ivf(vectors, ids)
+
+    naive = recall_report(idx, vectors[:200], k=10, path=None)
+    held_out = recall_report(idx, vectors[:200], k=10, path=str(tmp_path / "report.json"),
+                             query_ids=ids[:200])
+    assert held_out["recall@10"] < naive["recall@10"] - 0.05
+    assert (tmp_path / "report.json").exists()
+
+
+def test_exact_index_scores_full_recall_held_out():
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((500, 16)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    idx = faiss.IndexIDMap2(faiss.IndexFlatIP(16))
+    ids = np.arange(500, dtype=np.int64)
+    idx.add_with_ids(vectors, ids)
+    assert recall_report(idx, vectors[:50], k=5, path=None, query_ids=ids[:50])["recall@5"] == 1.0
+
+
+def test_run_report_leaves_out_the_queries_themselves(dedup_env, monkeypatch):
+    monkeypatch.setattr(dedup_env, "INDEX_REPORT", True)
+    dedup_env.run(articles=make_articles(12))
+    with open("deduplication/index_report.json", encoding="utf-8") as f:
+        report = json.load(f)
+    assert report["queries"] == 12 and report["recall@10"] == 1.0
@@ -0,0 +1,61 @@
+# pipeline/tests/test_keys_prefilter.py
+# Canonical URLs make the same story compare equal however it was linked,
+# and the exact-duplicate prefilter remembers keys from earlier runs.
+
+import pytest
+
+from conftest import make_articles
+from deduplication.prefilter import SeenStore, prefilter
+from storage.keys import canonical_url
+
+CANONICAL = "https://example.com/news/story?id=7"
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/news/story?id=7",
+    "https://example.com/news/story?utm_source=x&id=7&utm_medium=rss",
+    "https://example.com/news/story?id=7&fbclid=abc&ref=hn",
+    "https://example.com/news/story/?id=7",
+    "HTTP://Example.COM/news/story?id=7",
+    "https://www.example.com:443/news/story?id=7#comments",
+])
+def test_canonical_url_equal_forms(url):
+    assert canonical_url(url) == CANONICAL
+
+
+def test_canonical_url_keeps_meaningful_differences():
+    assert canonical_url("https://example.com/News/story?id=7") != CANONICAL   # paths are case-sensitive
+    assert canonical_url("https://example.com/news/story?id=8") != CANONICAL
+    assert canonical_url("https://example.com/news/story?b=2&a=1") == "https://example.com/news/story?a=1&b=2"
+    assert canonical_url("https://example.com/") == "https://example.com/"
+    assert canonical_url("") == ""
+
+
+def test_prefilter_hits_across_runs(tmp_path):
+    path = str(tmp_path / "articles.db")
+    first = make_articles(3)
+    seen = SeenStore(path)
+    survivors, duplicates, keys = prefilter(first, seen)
+    assert (survivors, duplicates) == ([0, 1, 2], [])
+    seen.add(keys)
+    seen.close()
+
+    # A later run: one story relinked with tracking params, one with the same
+    # text under a new URL, and one genuinely new
+    relinked = dict(first[0], url=first[0]["url"] + "/?utm_source=newsletter")
+    reposted = dict(first[1], url="https://mirror.example.org/copy")
+    fresh = make_articles(1, start=3)[0]
+    seen = SeenStore(path)
+    survivors, duplicates, _ = prefilter([relinked, reposted, fresh], seen)
+    seen.close()
+    assert (survivors, duplicates) == ([2], [0, 1])
+
+
+def test_prefilter_without_add_forgets_the_batch(tmp_path):
+    path = str(tmp_path / "articles.db")
+    seen = SeenStore(path)
+    prefilter(make_articles(2), seen)
+    seen.close()
+    seen = SeenStore(path)
+    assert prefilter(make_articles(2), seen)[:2] == ([0, 1], [])
+    seen.close()
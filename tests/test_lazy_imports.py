@@ -0,0 +1,50 @@
+# pipeline/tests/test_lazy_imports.py
+# Importing a stage, or opening an existing dedup index, must not load torch,
+# transformers or sentence_transformers.
+
+import re
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+STAGE_MODULES = ("deduplication.engine", "summarization.engine", "orchestration.pipeline")
+HEAVY_MODULES = ("torch", "transformers", "sentence_transformers")
+
+
+def run_probe(code: str, tmp_path) -> None:
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True,
+                         env={"PYTHONPATH": ROOT, "PATH": ""})
+    missing = re.search(r"ModuleNotFoundError: No module named '([\w.]+)'", out.stderr)
+    if out.returncode and missing and missing.group(1).split(".")[0] not in HEAVY_MODULES:
+        pytest.skip(f"{missing.group(1)} is not installed")
+    assert out.returncode == 0, out.stderr
+
+
+@pytest.mark.parametrize("module", STAGE_MODULES)
+def test_stage_import_loads_no_model(module, tmp_path):
+    run_probe(f"""
+import sys
+import {module}
+loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+assert not loaded, loaded
+""", tmp_path)
+
+
+def test_existing_index_opens_without_model(tmp_path):
+    run_probe(f"""
+import os, sys
+for name in {HEAVY_MODULES!r}:
+    sys.modules[name] = None   # any import of them fails the test
+import faiss
+from deduplication import engine
+from deduplication.embedding_cache import EmbeddingCache
+os.makedirs("deduplication", exist_ok=True)
+faiss.write_index(faiss.IndexIDMap2(faiss.IndexFlatIP(384)), engine.INDEX_PATH)
+EmbeddingCache(engine.EMBED_MODEL, 384)
+assert engine.get_index().d == 384
+assert engine.get_embedding_cache().dim == 384
+assert engine.encode_texts([]).shape == (0, 384)
+""", tmp_path)
@@ -0,0 +1,65 @@
+# pipeline/tests/test_normalize_date.py
+# normalize_date turns every source's timestamp format into UTC ISO 8601,
+# and its cache never holds on to a failed parse.
+
+import pytest
+
+from data_ingestion import utils
+from data_ingestion.utils import normalize_date
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    normalize_date.cache_clear()
+    yield
+    normalize_date.cache_clear()
+
+
+@pytest.mark.parametrize("raw", [
+    "2025-08-11 10:00:00",          # NewsData.io
+    "2025-08-11T10:00:00",
+    "11 Aug 2025 10:00:00",
+])
+def test_naive_times_are_utc(raw):
+    assert normalize_date(raw) == "2025-08-11T10:00:00+00:00"
+
+
+@pytest.mark.parametrize("raw", [
+    "2025-08-11T10:00:00Z",
+    "2025-08-11T12:00:00+02:00",
+    "2025-08-11T05:00:00-05:00",
+    "Mon, 11 Aug 2025 10:00:00 GMT",
+    "Mon, 11 Aug 2025 12:00:00 +0200",
+])
+def test_aware_times_convert_to_utc(raw):
+    assert normalize_date(raw) == "2025-08-11T10:00:00+00:00"
+
+
+@pytest.mark.parametrize("raw", [1754906400, 1754906400.0, "1754906400", " 1754906400.0 "])
+def test_epoch_seconds(raw):
+    assert normalize_date(raw) == "2025-08-11T10:00:00+00:00"
+
+
+def test_date_only_and_bare_numbers_are_not_epochs():
+    assert normalize_date("2025-08-11") == "2025-08-11T00:00:00+00:00"
+    assert normalize_date("20250811").startswith("2025-08-11")
+
+
+@pytest.mark.parametrize("raw", [None, "", "   ", "garbage", "not a date at all", "99999999999999999999"])
+def test_garbage_is_none(raw):
+    assert normalize_date(raw) is None
+
+
+def test_errors_are_not_cached(monkeypatch):
+    raw = "August 11th 2025, 10am"
+    real_parse = utils.date_parser.parse
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("parser blew up")
+
+    monkeypatch.setattr(utils.date_parser, "parse", broken)
+    with pytest.raises(RuntimeError):
+        normalize_date(raw)
+    monkeypatch.setattr(utils.date_parser, "parse", real_parse)
+    assert normalize_date(raw) == "2025-08-11T10:00:00+00:00"
+    assert normalize_date.cache_info().currsize == 1
@@ -0,0 +1,63 @@
+# pipeline/tests/test_preprocess_fast_path.py
+# The regex fast path in clean_html must give exactly what BeautifulSoup gives.
+
+import random
+
+import pytest
+from bs4 import BeautifulSoup
+
+from data_ingestion.preprocess_data import WHITESPACE_REGEX, clean_html, strip_simple_html
+
+SAMPLES = [
+    "",
+    "Plain text with   extra\n\nwhitespace",
+    "<p>OpenAI releases <b>GPT</b> update</p>",
+    '<a href="https://example.com/a?b=1&amp;c=2" title=\'x\'>link</a> text',
+    "<div class=summary><p>First.</p><p>Second &amp; third.</p></div>",
+    "AT&amp;T &lt;3 caf&eacute; &copy; 2024 &#8212; &#x2014; &nbsp;end",
+    "Tom & Jerry & friends",
+    "R&D budget",
+    "a &amp b",
+    "<img src='x.png'/> caption<br/>next line<br>",
+    "<!-- comment --><p>after comment</p>",
+    "<![CDATA[raw]]> text",
+    "<script>var x = '<p>';</script><p>body</p>",
+    "<style>p { color: red }</style>text",
+    "1 < 2 and 3 > 2",
+    "<p>unclosed <i>italic",
+    "&#0; &#128; &#xD800; &#x110000; control refs",
+    "&notanentity; and &amp",
+    "<UL><LI>Upper</LI><li>lower</li></UL>",
+    '<p data-x="a > b">attr with gt</p>',
+    "<title>Title</title><p>p</p>",
+    "smart “quotes” and emoji 🚀 stay",
+]
+
+FRAGMENTS = ["<p>", "</p>", "<b>", "</b>", "<br/>", "&amp;", "&lt;", "&eacute;", "&#233;", "&#x2014;",
+             "&", "<", ">", "text", " ", "\n", "<a href='u'>", "</a>", "&nbsp;", "&bogus;", "<!--c-->"]
+
+
+def soup_text(raw_html: str) -> str:
+    text = BeautifulSoup(raw_html, "html.parser").get_text()
+    return WHITESPACE_REGEX.sub(" ", text).strip()
+
+
+@pytest.mark.parametrize("raw_html", SAMPLES)
+def test_fast_path_matches_beautifulsoup(raw_html):
+    assert clean_html(raw_html) == soup_text(raw_html)
+
+
+def test_fast_path_matches_beautifulsoup_on_random_markup():
+    rng = random.Random(0)
+    fast = 0
+    for _ in range(2000):
+        raw_html = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 12)))
+        if strip_simple_html(raw_html) is not None:
+            fast += 1
+        assert clean_html(raw_html) == soup_text(raw_html), raw_html
+    assert fast  # the fast path is actually exercised
+
+
+def test_simple_markup_takes_the_fast_path():
+    assert strip_simple_html("<p>a &amp; b</p>") == "a & b"
+    assert strip_simple_html("<script>x</script>") is None
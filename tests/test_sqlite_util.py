@@ -0,0 +1,39 @@
+# pipeline/tests/test_sqlite_util.py
+# The shared SQLite helper: chunked IN queries and per-store connections.
+
+import sqlite3
+
+from deduplication.index_meta import VectorMetaStore
+from deduplication.prefilter import SeenStore
+from storage import sqlite_util
+from storage.repository import ArticleRepository
+
+
+def test_in_chunks_covers_every_value(monkeypatch):
+    monkeypatch.setattr(sqlite_util, "SQL_PARAM_CHUNK", 3)
+    chunks = list(sqlite_util.in_chunks(range(7)))
+    assert [c for c, _ in chunks] == [[0, 1, 2], [3, 4, 5], [6]]
+    assert [m for _, m in chunks] == ["?,?,?", "?,?,?", "?"]
+    assert list(sqlite_util.in_chunks([])) == []
+
+
+def test_stores_query_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_util, "SQL_PARAM_CHUNK", 4)
+    path = str(tmp_path / "db" / "articles.db")
+    seen = SeenStore(path)
+    seen.add(f"url:{i}" for i in range(10))
+    assert seen.contains(f"url:{i}" for i in range(5, 15)) == {f"url:{i}" for i in range(5, 10)}
+    seen.close()
+
+    meta = VectorMetaStore(path)
+    meta.add((i, None, "NewsAPI") for i in range(10))
+    meta.remove(list(range(9)))
+    assert meta.count() == 1
+    meta.close()
+
+
+def test_repository_uses_wal_and_rows(tmp_path):
+    repo = ArticleRepository(str(tmp_path / "articles.db"))
+    assert repo.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert repo.conn.row_factory is sqlite3.Row
+    repo.close()
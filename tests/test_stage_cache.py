@@ -0,0 +1,30 @@
+# pipeline/tests/test_stage_cache.py
+# A stage's fingerprint must cover every project module the stage imports.
+
+import os
+
+import pytest
+
+from conftest import ROOT
+from storage.stage_cache import code_files
+
+
+@pytest.mark.parametrize("stage, expected", [
+    ("summarization/engine.py", ["summarization/backends.py", "summarization/summary_cache.py",
+                                 "summarization/images.py", "summarization/extractive.py",
+                                 "data_ingestion/http_client.py", "storage/repository.py"]),
+    ("deduplication/engine.py", ["deduplication/categories.py", "deduplication/minhash.py",
+                                 "storage/keys.py", "contracts/records.py"]),
+    ("rendering/build_newsletter.py", ["rendering/categorize.py", "deduplication/embedding_cache.py"]),
+])
+def test_code_files_follow_imports(stage, expected):
+    found = {os.path.relpath(p, ROOT).replace(os.sep, "/") for p in code_files(os.path.join(ROOT, stage))}
+    assert stage in found
+    assert set(expected) <= found
+    assert all(not p.startswith("..") for p in found)
+
+
+def test_code_files_resolve_relative_imports():
+    found = {os.path.relpath(p, ROOT).replace(os.sep, "/")
+             for p in code_files(os.path.join(ROOT, "data_ingestion", "main.py"))}
+    assert {"data_ingestion/runner.py", "data_ingestion/watermarks.py"} <= found
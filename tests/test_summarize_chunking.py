@@ -0,0 +1,64 @@
+# pipeline/tests/test_summarize_chunking.py
+# Map-reduce summarization of long texts, with a whitespace tokenizer and a
+# summarizer stub in place of the model.
+
+import pytest
+
+from summarization import engine
+from summarization.engine import chunk_windows
+
+
+class StubTokenizer:
+    model_max_length = 12   # windows of 10 tokens
+
+    def __call__(self, texts, add_special_tokens=False):
+        return {"input_ids": [text.split() for text in texts]}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(ids)
+
+
+class StubSummarizer:
+    """
+    Returns its input unchanged, so joined window summaries never get shorter
+    and every long text reaches the last reduce round.
+    """
+    tokenizer = StubTokenizer()
+
+    def __init__(self):
+        self.inputs = []
+
+    def __call__(self, texts, batch_size=1, **kwargs):
+        texts = [texts] if isinstance(texts, str) else texts
+        self.inputs.extend(texts)
+        return [{"summary_text": text} for text in texts]
+
+
+@pytest.mark.parametrize("n_tokens, max_tokens, overlap", [
+    (5, 10, 3), (10, 10, 3), (11, 10, 3), (95, 10, 3), (1000, 900, 100), (57, 10, 100),
+])
+def test_chunk_windows_cover_text(n_tokens, max_tokens, overlap):
+    windows = chunk_windows(n_tokens, max_tokens, overlap)
+    assert windows[0][0] == 0 and windows[-1][1] == n_tokens
+    assert all(0 < end - start <= max_tokens for start, end in windows)
+    for (s1, e1), (s2, e2) in zip(windows, windows[1:]):
+        assert s1 < s2 <= e1   # consecutive windows overlap or touch, and advance
+
+
+def test_summarize_texts_truncates_after_reduce_rounds(monkeypatch, capsys):
+    stub = StubSummarizer()
+    monkeypatch.setattr(engine, "get_summarizer", lambda: stub)
+    limit = engine.max_input_tokens(stub.tokenizer)
+    short = "short text that fits"
+    long = " ".join(f"w{i}" for i in range(60))
+
+    results = engine.summarize_texts([short, long], ["Short", "Long"])
+
+    assert all(len(text.split()) <= limit for text in stub.inputs)
+    assert results[0] == short
+    # Last round: the first window of the still-too-long text, not the whole of it
+    assert len(results[1].split()) == limit
+    assert results[1] in stub.inputs
+    log = capsys.readouterr().out
+    assert f"Round {engine.REDUCE_ROUNDS - 1}:" in log
+    assert f"after {engine.REDUCE_ROUNDS - 1} reductions; truncating to {limit}" in log
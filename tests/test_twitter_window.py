@@ -0,0 +1,34 @@
+# pipeline/tests/test_twitter_window.py
+# Twitter recent search resumes from the stored tweet while it is inside the
+# API's 7-day window, and from the window's edge after that.
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("tweepy")
+
+from data_ingestion.twitter_fetcher import SEARCH_WINDOW, WINDOW_MARGIN, resume_params
+
+NOW = datetime(2026, 10, 19, 6, 5, tzinfo=timezone.utc)
+MARK = {"id": "1849000000000000000", "timestamp": "2026-10-12T06:04:00+00:00"}
+
+
+def test_first_run_searches_the_whole_window():
+    assert resume_params({}, None, NOW) == {}
+
+
+@pytest.mark.parametrize("age", [timedelta(hours=1), timedelta(days=6, hours=23)])
+def test_mark_inside_the_window_uses_since_id(age):
+    assert resume_params(MARK, NOW - age, NOW) == {"since_id": MARK["id"]}
+
+
+@pytest.mark.parametrize("age", [SEARCH_WINDOW, SEARCH_WINDOW + timedelta(minutes=1), timedelta(days=10)])
+def test_mark_outside_the_window_starts_at_its_edge(age):
+    # Weekly cron: last week's newest tweet is just over 7 days old
+    assert resume_params(MARK, NOW - age, NOW) == {"start_time": NOW - SEARCH_WINDOW + WINDOW_MARGIN}
+
+
+def test_mark_without_an_id_uses_its_timestamp():
+    last_seen = NOW - timedelta(days=2)
+    assert resume_params({"timestamp": last_seen.isoformat()}, last_seen, NOW) == {"start_time": last_seen}